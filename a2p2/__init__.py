@@ -6,7 +6,6 @@ from .version import __version__
 
 from . import facility
 from . import instrument
-from . import gui
 from . import samp
 from . import client
 from .client import A2p2Client
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+__all__ = []
+
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import os
+import threading
+
+from a2p2.console import ConsoleUI
+from a2p2.ob import OBXML_EXT
+
+# client of the current worker process or submission thread
+_worker = threading.local()
+
+
+class BatchUI(ConsoleUI):
+
+    """ Record logs of the OB being processed instead of printing them. """
+
+    def __init__(self, a2p2client):
+        ConsoleUI.__init__(self, a2p2client)
+        self.logs = []
+
+    def addToLog(self, text, displayString=True):
+        if displayString or self.a2p2client.verbose:
+            self.logs.append(str(text))
+
+    def ShowErrorMessage(self, text):
+        self.logs.append("ERROR: %s" % text)
+
+    def ShowWarningMessage(self, text):
+        self.logs.append("WARNING: %s" % text)
+
+    def popLogs(self):
+        logs = self.logs
+        self.logs = []
+        return logs
+
+
+def listOBs(paths):
+    """ Return the OB files given directly or found in given directories. """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, f)
+                            for f in os.listdir(path) if f.endswith(OBXML_EXT))
+        else:
+            files.append(path)
+    return files
+
+
+def createClient(verbose=False):
+    """ Return a headless client that records its logs. """
+    from a2p2.client import A2p2Client
+    client = A2p2Client(headless=True, verbose=verbose)
+    client.ui = BatchUI(client)
+    return client
+
+
+def getInstrument(client, ob):
+    """ Return facility and instrument supporting given OB.
+
+    ValueError raised if the instrument is not supported."""
+    interferometer = ob.interferometerConfiguration.name
+    insname = ob.instrumentConfiguration.name
+    facility = client.facilityManager.facilities.get(interferometer)
+    if not facility or not facility.hasSupportedInsname(insname):
+        raise ValueError("unsupported instrument %s @ %s" %
+                         (insname, interferometer))
+    return facility, facility.getInstrument(insname)
+
+
+def processOB(client, path, submit=False):
+    """ Check (or submit) OB of given file. Return (path, error, logs). """
+    try:
+        ob = client.obCache.load(path)
+        facility, instrument = getInstrument(client, ob)
+        if submit:
+            instrument.submitOB(ob, facility.containerInfo)
+        else:
+            instrument.checkOB(ob, facility.containerInfo)
+        error = None
+    except Exception as e:
+        error = "%s: %s" % (type(e).__name__, str(e).strip())
+    return path, error, client.ui.popLogs()
+
+
+def _initChecker(verbose):
+    _worker.client = createClient(verbose)
+
+
+def _check(path):
+    return processOB(_worker.client, path)
+
+
+def _initSubmitter(username, password, containerId, historyUsername, verbose):
+    # every submission thread owns its P2 session
+    _worker.error = None
+    try:
+        client = createClient(verbose)
+        if historyUsername:
+            client.setUsername(historyUsername)
+        facility = client.facilityManager.facilities["VLTI"]
+        facility.ui.containerId = containerId
+        facility.connectAPI(username, password, None)
+        _worker.client = client
+        if not facility.isReadyToSubmit():
+            _worker.error = "P2 session not ready: " + \
+                " ".join(client.ui.popLogs())
+    except Exception as e:
+        # an exception would restart the thread forever
+        _worker.error = "Can't open P2 session: %s" % e
+
+
+def _submit(path):
+    if _worker.error:
+        return path, _worker.error, []
+    return processOB(_worker.client, path, True)
+
+
+def checkOBs(files, workers=None, verbose=False):
+    """ Check given OB files in a pool of worker processes. Return a list of (path, error, logs). """
+    pool = multiprocessing.Pool(workers, _initChecker, (verbose,))
+    try:
+        return pool.map(_check, files)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def submitOBs(files, containerId, username, password, sessions=2, historyUsername=None, verbose=False):
+    """ Submit given OB files using a pool of P2 sessions. Return a list of (path, error, logs). """
+    pool = ThreadPool(sessions, _initSubmitter, (username, password,
+                                                 containerId, historyUsername, verbose))
+    try:
+        return pool.map(_submit, files)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def formatReport(results, title):
+    """ Return a summary of the given results. """
+    failed = [r for r in results if r[1]]
+    buffer = "%s: %d OB(s), %d OK, %d failed\n" % (
+        title, len(results), len(results) - len(failed), len(failed))
+    for path, error, logs in failed:
+        buffer += "  %s : %s\n" % (path, error)
+    return buffer
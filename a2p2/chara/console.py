@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+
+__all__ = []
+
+import traceback
+
+from a2p2.console import FacilityConsoleUI
+from a2p2.chara.facility import _HR
+
+
+class CharaConsoleUI(FacilityConsoleUI):
+
+    """ Headless replacement of CharaUI: reports are printed in the console. """
+
+    def displayOB(self, ob):
+        try:
+            buffer = self.facility.extractReport(ob)
+        except:
+            buffer = "Error during report generation\n" + \
+                traceback.format_exc() + _HR + str(ob)
+
+        self.addToLog(buffer)
@@ -3,14 +3,15 @@
 __all__ = ['A2p2Client']
 
 from a2p2.facility import FacilityManager
-from a2p2.gui import MainWindow
 from a2p2.samp import A2p2SampClient
-from a2p2.ob import OB
+from a2p2.obcache import OBCache
 from a2p2 import __version__
 import sys
-import time
 import traceback
 
+# delay (ms) between two hub connection checks
+TICK_DELAY = 1000
+
 
 class A2p2Client():
 
@@ -20,17 +21,35 @@ class A2p2Client():
            a2p2.run()
            ..."""
 
-    def __init__(self, fakeAPI=False):
-        """Create the A2p2 client."""
+    def __init__(self, fakeAPI=False, headless=False, verbose=False, spoolDir=None):
+        """Create the A2p2 client.
+
+        headless clients log in the console and do not require any display.
+        OB files dropped in spoolDir are processed as the ones sent by Aspro2."""
 
         self.username = None
         self.apiName = ""
         if fakeAPI:
             self.apiName = "fakeAPI"
+        self.headless = headless
+        self.verbose = verbose
 
-        self.ui = MainWindow(self)
+        if headless:
+            from a2p2.console import ConsoleUI
+            self.ui = ConsoleUI(self)
+        else:
+            from a2p2.gui import MainWindow
+            self.ui = MainWindow(self)
         # Instantiate the samp client and connect to the hub later
         self.a2p2SampClient = A2p2SampClient()
+        # every source provides the same message interface
+        self.sources = [self.a2p2SampClient]
+        self.a2p2SpoolClient = None
+        if spoolDir:
+            from a2p2.spool import A2p2SpoolClient
+            self.a2p2SpoolClient = A2p2SpoolClient(spoolDir)
+            self.sources.append(self.a2p2SpoolClient)
+        self.obCache = OBCache()
         self.facilityManager = FacilityManager(self)
 
         pass
@@ -79,51 +98,59 @@ class A2p2Client():
             print ("progress is  %s %%" % (perc))
 
     def run(self):
-        # bool of status change
-        flag = [0]
-
-        # We now run the loop to wait for the message in a try/finally block so that if
-        # the program is interrupted e.g. by control-C, the client terminates
-        # gracefully.
-
-        # We test every 1s to see if the hub has sent a message
-        delay = 0.1
-        each = 10
-        loop_cnt = 0
-        warnForAspro = True
-
-        while loop_cnt >= 0:
+        # OB processing and reconnection are triggered as soon as the samp
+        # client gets a message or loses the hub. The ui event loop also
+        # checks the (cached) connection state every TICK_DELAY.
+        self.warnForAspro = True
+        self.processing = False
+        self.a2p2SampClient.set_message_listener(self.ui.wakeup)
+        self.a2p2SampClient.set_connection_listener(self.ui.wakeup)
+        self.ui.run(self.checkConnection, TICK_DELAY)
+
+    def checkConnection(self):
+        """ Try to (re)connect to the hub if not connected, scan the spool directory and process pending messages."""
+        if not self.a2p2SampClient.is_connected():
             try:
-                loop_cnt += 1
-                time.sleep(delay)
-
-                self.ui.loop()
-
-                if not self.a2p2SampClient.is_connected() and loop_cnt % each == 0:
-                    try:
-                        self.a2p2SampClient.connect()
-                        self.ui.setSampId(self.a2p2SampClient.get_public_id())
-                    except:
-                        self.ui.setSampId(None)
-                        if warnForAspro:
-                            warnForAspro = False
-                            self.ui.addToLog(
-                                "\nPlease launch Aspro2 to submit your OBs.")
-                        pass  # TODO test for other exception than SAMPHubError(u'Unable to find a running SAMP Hub.',)
-
-                if self.a2p2SampClient.has_message():
+                self.a2p2SampClient.connect()
+                self.ui.setSampId(self.a2p2SampClient.get_public_id())
+            except:
+                self.ui.setSampId(None)
+                if self.warnForAspro:
+                    self.warnForAspro = False
+                    self.ui.addToLog(
+                        "\nPlease launch Aspro2 to submit your OBs.")
+                pass  # TODO test for other exception than SAMPHubError(u'Unable to find a running SAMP Hub.',)
+        if self.a2p2SpoolClient:
+            try:
+                self.a2p2SpoolClient.scan()
+            except OSError:
+                self.ui.addToLog("Can't scan spool directory: " +
+                                 traceback.format_exc(), False)
+        self.processMessages()
+
+    def processMessages(self):
+        """ Process every buffered message in reception order. """
+        # ui refreshes during processOB may run the event loop again
+        if self.processing:
+            return
+        self.processing = True
+        try:
+            for source in self.sources:
+                while source.has_message():
+                    processed = False
                     try:
-                        ob = OB(self.a2p2SampClient.get_ob_url())
+                        ob = self.obCache.load(source.get_ob_url())
                         self.facilityManager.processOB(ob)
+                        processed = True
+                        self.ui.addToLog("OB cache: " +
+                                         self.obCache.get_status(), False)
                     except:
                         self.ui.addToLog(
                             "Exception during ob creation: " + traceback.format_exc(), False)
-                        self.ui.addToLog("Can't process last OB")
+                        self.ui.addToLog("Can't process OB #%s" %
+                                         source.get_message_id())
 
                     # always clear previous received message
-                    self.a2p2SampClient.clear_message()
-
-                if self.ui.requestAbort:
-                    loop_cnt = -1
-            except KeyboardInterrupt:
-                loop_cnt = -1
+                    source.clear_message(processed)
+        finally:
+            self.processing = False
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+__all__ = []
+
+import signal
+import sys
+import threading
+
+from a2p2 import __version__
+
+
+class ConsoleUI():
+
+    """
+    Headless replacement of gui.MainWindow.
+
+    Messages are printed on the standard outputs, detailed logs only in verbose
+    mode, and the event loop waits on a threading.Event instead of Tk.
+    """
+
+    def __init__(self, a2p2client):
+
+        self.a2p2client = a2p2client
+
+        self.requestAbort = False
+        self.event = threading.Event()
+        self.helps = {}
+        self.sampId = None
+
+    def setSampId(self, id):
+        if id != self.sampId:
+            self.sampId = id
+            if id:
+                self.addToLog("A2P2 v%s connected to the hub [%s]" %
+                              (__version__, id))
+
+    def _requestAbort(self, *args):
+        self.requestAbort = True
+        self.event.set()
+
+    def addHelp(self, tabname, txt):
+        self.helps[tabname] = txt
+
+    def showFacilityUI(self, facilityUI):
+        pass
+
+    def run(self, onWakeup, delay):
+        """ Run the event loop until abort is requested.
+
+        onWakeup is called on every wakeup() and at least every delay ms."""
+        # control-C stops the loop gracefully
+        signal.signal(signal.SIGINT, self._requestAbort)
+        while not self.requestAbort:
+            onWakeup()
+            self.event.wait(delay / 1000.0)
+            self.event.clear()
+
+    def wakeup(self):
+        """ Ask the event loop to handle samp events. May be called from any thread. """
+        self.event.set()
+
+    def update_status_bar(self):
+        pass
+
+    def addToLog(self, text, displayString=True):
+        if displayString or self.a2p2client.verbose:
+            print(str(text))
+            sys.stdout.flush()
+
+    def ShowErrorMessage(self, text):
+        sys.stderr.write("ERROR: %s\n" % text)
+
+    def ShowWarningMessage(self, text):
+        sys.stderr.write("WARNING: %s\n" % text)
+
+    def ShowInfoMessage(self, text):
+        self.addToLog(text)
+
+    def setProgress(self, perc):
+        pass
+
+
+class FacilityConsoleUI():
+
+    """ Headless replacement of gui.FacilityUI. """
+
+    def __init__(self, facility):
+        self.facility = facility
+        self.a2p2client = facility.a2p2client
+
+    def addToLog(self, text, displayString=True):
+        """ Wrapper to log message in the common console """
+        self.a2p2client.ui.addToLog(text, displayString)
+
+    def ShowErrorMessage(self, text):
+        self.a2p2client.ui.ShowErrorMessage(text)
+
+    def ShowWarningMessage(self, text):
+        self.a2p2client.ui.ShowWarningMessage(text)
+
+    def ShowInfoMessage(self, text):
+        self.a2p2client.ui.ShowInfoMessage(text)
+
+    def setProgress(self, perc):
+        self.a2p2client.ui.setProgress(perc)
+
+    def ask(self, question, default, hidden=False):
+        return ask(question, default, hidden)
+
+
+def ask(question, default, hidden=False):
+    """ Return the answer read on stdin or default value if stdin is not a terminal. """
+    if not sys.stdin.isatty():
+        return default
+    prompt = "%s [%s]: " % (question, "*" * len(default) if hidden else default)
+    if hidden:
+        import getpass
+        answer = getpass.getpass(prompt)
+    else:
+        try:
+            answer = raw_input(prompt)
+        except NameError:  # python 3
+            answer = input(prompt)
+    return answer.strip() or default
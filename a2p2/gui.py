@@ -14,7 +14,10 @@ else:
     from tkinter.messagebox import *
     import tkinter.ttk as ttk
 
-import time
+import signal
+
+# virtual event generated when a new message has been received
+MESSAGE_EVENT = "<<A2P2Message>>"
 
 HELPTEXT = """This application provides the link between ASPRO (that you should have started) and interferometers facilities.
 
@@ -75,8 +78,9 @@ class MainWindow():
         else:
             self.window.title("A2P2 v" + __version__)
 
-    def _requestAbort(self):
+    def _requestAbort(self, *args):
         self.requestAbort = True
+        self.window.quit()
 
     def addHelp(self, tabname, txt):
         frame = Frame(self.helptabs)
@@ -98,23 +102,45 @@ class MainWindow():
             self.registerTab(facilityUI.facility.facilityName, facilityUI)
         self.notebook.select(self.tabIdx[facilityUI.facility.facilityName])
 
-    def quitAfterRunOnce(self):
-        self.window.quit()
+    def run(self, onWakeup, delay):
+        """ Run the Tk mainloop until abort is requested.
+
+        onWakeup is called on every wakeup() and at least every delay ms."""
+        def wakeup(event=None):
+            onWakeup()
+            self.update_status_bar()
 
-    def loop(self):
-        self.window.after(50, self.quitAfterRunOnce)
+        def tick():
+            wakeup()
+            self.window.after(delay, tick)
+
+        self.window.bind(MESSAGE_EVENT, wakeup)
+        self.window.after_idle(tick)
+
+        # control-C stops the loop gracefully
+        signal.signal(signal.SIGINT, self._requestAbort)
         self.window.mainloop()
-        self.update_status_bar()
+
+    def wakeup(self):
+        """ Ask the event loop to handle samp events. May be called from any thread. """
+        try:
+            self.window.event_generate(MESSAGE_EVENT, when="tail")
+        except (RuntimeError, TclError):
+            # non threaded tcl or loop not yet running: next tick will process it
+            pass
 
     def innerloop(self):
-        self.window.after(50, self.quitAfterRunOnce)
-        self.window.mainloop()
+        # refresh widgets without leaving the current callback
+        self.window.update()
 
     def update_status_bar(self):
         self.status_bar.set_label("SAMP", "SAMP: %s" %
                                   self.a2p2client.a2p2SampClient.get_status())
         self.status_bar.set_label(
             "API", "%s" % self.a2p2client.facilityManager.get_status())
+        if self.a2p2client.a2p2SpoolClient:
+            self.status_bar.set_label("SPOOL", "SPOOL: %s" %
+                                      self.a2p2client.a2p2SpoolClient.get_status())
 
     def get_api(self):
         return self.api
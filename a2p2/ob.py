@@ -2,14 +2,27 @@
 
 __all__ = []
 
-from astropy.coordinates import SkyCoord
-import cgi
-import numpy as np
+import itertools
+import os
 import re
+import threading
 import traceback
 import xml.etree.ElementTree as ET
 import json
-from collections import defaultdict, namedtuple, Iterable, OrderedDict
+from collections import defaultdict, namedtuple, OrderedDict
+
+# extension of OB files
+OBXML_EXT = ".obxml"
+
+# OB files bigger than this size (bytes) are streamed by default
+STREAMING_SIZE = 10 * 1024 * 1024
+# element streamed in streaming mode
+STREAMED_ELEMENT = "observationConfiguration"
+
+# max number of namedtuple classes kept for OB elements
+MAX_RECORD_CLASSES = 256
+_recordClasses = OrderedDict()
+_recordClassesLock = threading.Lock()
 
 
 # https://stackoverflow.com/questions/2148119/how-to-convert-an-xml-string-to-a-dictionary-in-python
@@ -37,6 +50,242 @@ def etree_to_dict(t):
     return d
 
 
+def etree_to_object(t, typename):
+    """
+    Return the value of given element in one walk: the stripped text for leaves
+    or a namedtuple (named typename) whose fields are the children tags (a list
+    for repeated tags) then the attributes.
+
+    The result is the same as parsing the etree_to_dict() output through
+    namedtuples.
+    """
+    children = list(t)
+    if not children and not t.attrib:
+        if t.text:
+            return t.text.strip()
+        return None
+
+    values = OrderedDict()
+    if children:
+        dd = OrderedDict()
+        for c in children:
+            dd.setdefault(c.tag, []).append(etree_to_object(c, typename))
+        for k, v in dd.items():
+            values[k] = v[0] if len(v) == 1 else v
+    values.update(t.attrib)
+    if t.text:
+        text = t.text.strip()
+        if text:
+            values['#text'] = text
+    if t.tag in MODELS:
+        return MODELS[t.tag](values)
+    return recordClass(typename, tuple(values.keys()))(*values.values())
+
+
+def recordClass(typename, fields):
+    """
+    Return the namedtuple class for given typename and fields.
+
+    Classes are shared by every OB of the process so many targets use the same
+    class. Least recently used ones are dropped above MAX_RECORD_CLASSES.
+    """
+    key = (typename, fields)
+    with _recordClassesLock:
+        try:
+            cls = _recordClasses.pop(key)
+        except KeyError:
+            cls = namedtuple(typename, fields)
+            # dynamic classes are not importable by pickle
+            cls.__reduce__ = _reduceRecord
+            while len(_recordClasses) >= MAX_RECORD_CLASSES:
+                _recordClasses.popitem(last=False)
+        _recordClasses[key] = cls
+    return cls
+
+
+def _reduceRecord(self):
+    return _rebuildRecord, (type(self).__name__, self._fields, tuple(self))
+
+
+def _rebuildRecord(typename, fields, values):
+    return recordClass(typename, fields)(*values)
+
+
+def iterparse_children(url, rootAttrib=None):
+    """
+    Yield every child element of the root of given file as soon as it is
+    parsed. Each element is removed from the tree once the caller resumes,
+    so memory stays bounded by the biggest child. Root attributes are stored
+    in rootAttrib if given.
+    """
+    depth = 0
+    root = None
+    for event, elem in ET.iterparse(url, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if root is None:
+                root = elem
+                if rootAttrib is not None:
+                    rootAttrib.update(elem.attrib)
+        else:
+            depth -= 1
+            if depth == 1:
+                yield elem
+                elem.clear()
+                root.remove(elem)
+
+
+class StreamedElements(object):
+
+    """
+    Lazy sequence of the root children of an OB file with a given tag.
+
+    Every iteration parses the file again and yields elements one at a time
+    with bounded memory. Indexing is supported but costs a partial parse.
+    """
+
+    def __init__(self, url, tag, count):
+        self.url = url
+        self.tag = tag
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for elem in iterparse_children(self.url):
+            if elem.tag == self.tag:
+                yield etree_to_object(elem, elem.tag)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if i < 0 or i >= self.count:
+            raise IndexError("%s index out of range" % self.tag)
+        return next(itertools.islice(iter(self), i, None))
+
+
+def object_to_dict(o):
+    """ Return given etree_to_object() value as nested dicts and lists. """
+    if isinstance(o, StreamedElements):
+        return "%d streamed %s" % (len(o), o.tag)
+    if isinstance(o, list):
+        return [object_to_dict(e) for e in o]
+    if isinstance(o, (tuple, Record)):
+        return OrderedDict((k, object_to_dict(v)) for k, v in o._asdict().items())
+    return o
+
+
+def sexagesimal_to_deg(text, hours=False):
+    """ Return decimal degrees of given '[-]dd:mm:ss.s' (or 'hh:mm:ss.s' if hours) text. """
+    fields = re.split('[: ]+', text.strip())
+    value = 0.0
+    for i, f in enumerate(fields):
+        value += abs(float(f)) / 60 ** i
+    if hours:
+        value *= 15.0
+    if fields[0].startswith('-'):
+        return -value
+    return value
+
+
+class Record(object):
+
+    """
+    Base class of typed OB elements.
+
+    Children values are stored in slots (_extra dict for unknown tags) and
+    converted once by CONVERTERS. As for namedtuples, _fields gives the
+    present children and missing ones raise AttributeError.
+    """
+    __slots__ = ('_fields', '_extra')
+    CONVERTERS = {}
+
+    def __init__(self, values):
+        self._fields = tuple(values.keys())
+        self._extra = {}
+        for k, v in values.items():
+            converter = self.getConverter(k)
+            if v is not None and converter:
+                try:
+                    v = converter(v)
+                except ValueError:
+                    raise ValueError("invalid %s value '%s' for %s" %
+                                     (k, v, values.get('name', type(self).__name__)))
+            try:
+                setattr(self, k, v)
+            except AttributeError:
+                self._extra[k] = v
+
+    @classmethod
+    def getConverter(cls, key):
+        return cls.CONVERTERS.get(key)
+
+    def __getattr__(self, name):  # called for missing slots only
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._extra[name]
+        except KeyError:
+            raise AttributeError(
+                "'%s' has no attribute '%s'" % (type(self).__name__, name))
+
+    def _asdict(self):
+        return OrderedDict((k, getattr(self, k)) for k in self._fields)
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, ", ".join("%s=%r" % i for i in self._asdict().items()))
+
+
+class Target(Record):
+
+    """
+    Target of an observation configuration.
+
+    FLUX_*, PMRA, PMDEC, PARALLAX and DIAMETER are floats. RA and DEC are
+    kept as given and also provided in decimal degrees by raDeg and decDeg
+    (None if not parsable).
+    """
+    __slots__ = ('name', 'RA', 'DEC', 'EQUINOX', 'SYSVEL', 'VELTYP', 'PMRA', 'PMDEC',
+                 'PARALLAX', 'PARA_ERR', 'IDS', 'OBJTYP', 'SPECTYP', 'DIAMETER',
+                 'FLUX_B', 'FLUX_V', 'FLUX_R', 'FLUX_I', 'FLUX_J', 'FLUX_H',
+                 'FLUX_K', 'FLUX_L', 'FLUX_M', 'FLUX_N', 'raDeg', 'decDeg')
+    CONVERTERS = dict((k, float) for k in (
+        'PMRA', 'PMDEC', 'PARALLAX', 'DIAMETER'))
+
+    @classmethod
+    def getConverter(cls, key):
+        if key.startswith('FLUX_'):
+            return float
+        return cls.CONVERTERS.get(key)
+
+    def __init__(self, values):
+        Record.__init__(self, values)
+        self.raDeg = self.decDeg = None
+        try:
+            self.raDeg = sexagesimal_to_deg(self.RA, hours=True)
+            self.decDeg = sexagesimal_to_deg(self.DEC)
+        except (AttributeError, ValueError):
+            pass
+
+
+class ObservationConfiguration(Record):
+
+    """ Observation configuration of one science or calibrator target. """
+    __slots__ = ('id', 'type', 'SCTarget', 'FTTarget', 'AOTarget', 'GSTarget',
+                 'observationConstraints')
+
+
+# typed models of OB elements (namedtuples are used for other elements)
+MODELS = {
+    'observationConfiguration': ObservationConfiguration,
+    'SCTarget': Target,
+    'FTTarget': Target,
+    'AOTarget': Target,
+    'GSTarget': Target
+}
+
+
 class OB():
 
     """
@@ -47,29 +296,61 @@ class OB():
     - ob.observationConfiguration[]
     - ob.observationSchedule
 
-    every values are string (must be converted for numeric values).
+    every values are string (must be converted for numeric values) except
+    numeric values of targets (see Target).
 
+    In streaming mode (default for files bigger than STREAMING_SIZE),
+    observationConfiguration is a lazy sequence of StreamedElements and the
+    whole document is never loaded in memory.
     """
 
-    def __init__(self, url):
-        # extract XML in elementTree
-        e = ET.parse(url)
-        d = etree_to_dict(e.getroot())
+    def __init__(self, url, streaming=None):
+        if streaming is None:
+            try:
+                streaming = os.path.getsize(url) > STREAMING_SIZE
+            except (OSError, TypeError):
+                streaming = False
+
         # keep only content of subelement to avoid schema version change
         # '{http://www.jmmc.fr/aspro-ob/0.1}observingBlockDefinition'
-        ds = d[list(d)[0]]  # -> version and name are lost
-        # store attributes
-        for e in ds.keys():
-             # parse JSON into an object with attributes corresponding to dict keys.
-             # We should probably avoid json use...
-            o = json.loads(
-                json.dumps(ds[e]), object_hook=lambda d: namedtuple(e, d.keys())(*d.values()))
-            # observationConfiguration may be uniq but force it to be a list
-            if "observationConfiguration" in e and not isinstance(o, list):
-                setattr(self, e, [o])
-            else:
-                setattr(self, e, o)
-        self.ds = ds
+        # -> version and name are lost
+        dd = OrderedDict()
+        rootAttrib = OrderedDict()
+        if streaming:
+            count = 0
+            for child in iterparse_children(url, rootAttrib):
+                if child.tag == STREAMED_ELEMENT:
+                    # just reserve its place
+                    dd.setdefault(child.tag, [])
+                    count += 1
+                else:
+                    dd.setdefault(child.tag, []).append(
+                        etree_to_object(child, child.tag))
+            if count:
+                dd[STREAMED_ELEMENT] = [
+                    StreamedElements(url, STREAMED_ELEMENT, count)]
+        else:
+            # extract XML in elementTree
+            root = ET.parse(url).getroot()
+            rootAttrib.update(root.attrib)
+            for child in root:
+                dd.setdefault(child.tag, []).append(
+                    etree_to_object(child, child.tag))
+
+        for k, v in dd.items():
+            setattr(self, k, v[0] if len(v) == 1 else v)
+        for k, v in rootAttrib.items():
+            setattr(self, k, v)
+        self.elements = list(dd) + list(rootAttrib)
+
+        # observationConfiguration may be uniq but force it to be a list
+        if "observationConfiguration" in dd and not isinstance(self.observationConfiguration, (list, StreamedElements)):
+            self.observationConfiguration = [self.observationConfiguration]
+
+    @property
+    def ds(self):
+        """ Return the OB content as nested dicts. """
+        return OrderedDict((e, object_to_dict(getattr(self, e))) for e in self.elements)
 
     def getFluxes(self, target):
         """
@@ -85,10 +366,7 @@ class OB():
         return OrderedDict(sorted(fluxes.items(), key=lambda t: order.find(t[0])))
 
     def get(self, obj, fieldname, defaultvalue=None):
-        if fieldname in obj._fields:
-            return getattr(obj, fieldname)
-        else:
-            return defaultvalue
+        return getattr(obj, fieldname, defaultvalue)
 
     def __str__(self):
         if True:
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+__all__ = []
+
+import hashlib
+import io
+import os
+import tempfile
+
+try:
+    import cPickle as pickle
+except ImportError:  # python 3
+    import pickle
+
+try:
+    from os import scandir
+except ImportError:  # python 2
+    from scandir import scandir
+
+from a2p2 import __version__
+from a2p2.ob import OB, STREAMING_SIZE
+
+# default location of the cache
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".a2p2", "obcache")
+# max size (bytes) of the cached OBs
+MAX_SIZE = 64 * 1024 * 1024
+# extension of cached OBs
+CACHE_EXT = ".ob"
+
+_replace = getattr(os, "replace", os.rename)
+
+
+class OBCache():
+
+    """
+    On-disk cache of parsed OBs keyed by the SHA-256 of the file content.
+
+    Repeated deliveries of the same OB are unpickled instead of being parsed
+    again. Entries are tagged with the a2p2 version so the format may change
+    between releases. Least recently used entries are removed once the cache
+    exceeds maxSize. Big files are streamed and never cached.
+    """
+
+    def __init__(self, cacheDir=CACHE_DIR, maxSize=MAX_SIZE):
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(cacheDir):
+            os.makedirs(cacheDir)
+        # (last use time, size) of entries
+        self.index = {}
+        for entry in scandir(cacheDir):
+            if entry.name.endswith(CACHE_EXT):
+                st = entry.stat()
+                self.index[entry.name] = (st.st_mtime, st.st_size)
+
+    def load(self, url):
+        """ Return the OB of given file, parsed or from the cache. """
+        if os.path.getsize(url) > STREAMING_SIZE:
+            return OB(url)
+
+        with open(url, "rb") as f:
+            data = f.read()
+        h = hashlib.sha256(__version__.encode())
+        h.update(data)
+        name = h.hexdigest() + CACHE_EXT
+        path = os.path.join(self.cacheDir, name)
+
+        ob = self.read(path)
+        if ob is not None:
+            self.hits += 1
+            self.touch(name, path)
+            return ob
+
+        self.misses += 1
+        ob = OB(io.BytesIO(data), streaming=False)
+        self.write(name, path, ob)
+        return ob
+
+    def read(self, path):
+        """ Return the cached OB or None. """
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (IOError, OSError):
+            return None
+        except Exception:
+            # corrupted entry
+            self.remove(os.path.basename(path))
+            return None
+
+    def write(self, name, path, ob):
+        # other processes may read the cache: write then move atomically
+        fd, tmp = tempfile.mkstemp(dir=self.cacheDir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(ob, f, pickle.HIGHEST_PROTOCOL)
+            _replace(tmp, path)
+        except (IOError, OSError, pickle.PicklingError):
+            self.remove(tmp)
+            return
+        self.touch(name, path)
+        self.evict()
+
+    def touch(self, name, path):
+        try:
+            os.utime(path, None)
+            st = os.stat(path)
+        except OSError:
+            self.index.pop(name, None)
+            return
+        self.index[name] = (st.st_mtime, st.st_size)
+
+    def remove(self, name):
+        self.index.pop(name, None)
+        try:
+            os.remove(os.path.join(self.cacheDir, name))
+        except OSError:
+            pass
+
+    def evict(self):
+        """ Remove least recently used entries above maxSize. """
+        size = sum(s for _, s in self.index.values())
+        if size <= self.maxSize:
+            return
+        for name, (_, s) in sorted(self.index.items(), key=lambda i: i[1][0]):
+            self.remove(name)
+            size -= s
+            if size <= self.maxSize:
+                break
+
+    def get_status(self):
+        return "%d hits, %d misses, %d OBs cached" % (self.hits, self.misses, len(self.index))
@@ -2,60 +2,163 @@
 
 __all__ = []
 
-from astropy.samp import SAMPIntegratedClient
+import itertools
+import threading
+import time
+
+try:
+    import queue
+except ImportError:  # python 2
+    import Queue as queue
+
+# max number of received messages waiting to be processed
+MAX_MESSAGES = 100
+# max time (s) the hub is blocked waiting for a free slot in a full buffer
+PUT_TIMEOUT = 10
+# delay (s) between two pings of the hub
+HEARTBEAT_DELAY = 2
 
 
 class Receiver(object):
 
-    def __init__(self, client):
+    """
+    Buffer ob.load.data messages received from the hub.
+
+    Every message is stored with a local id in a bounded FIFO so bursts of OBs
+    are never overwritten. When the buffer is full, the SAMP callbacks block
+    (backpressure on the hub) up to PUT_TIMEOUT before the message is refused.
+    """
+
+    def __init__(self, client, maxsize=MAX_MESSAGES):
         self.client = client
-        self.received = False
+        self.messages = queue.Queue(maxsize)
+        self.ids = itertools.count(1)
+        # (id, params, reception time) of the message being processed
+        self.current = None
+        # called (from the samp thread) after each new message
+        self.listener = None
 
     def receive_call(self, private_key, sender_id, msg_id, mtype, params, extra):
-        self.params = params
-        self.received = True
-        self.client.reply(
-            msg_id, {"samp.status": "samp.ok", "samp.result": {}})
+        if self.put(params):
+            self.client.reply(
+                msg_id, {"samp.status": "samp.ok", "samp.result": {}})
+            self.notify()
+        else:
+            self.client.reply(
+                msg_id, {"samp.status": "samp.error", "samp.error": {"samp.errortxt": "too many OBs waiting in A2P2"}})
 
     def receive_notification(self, private_key, sender_id, mtype, params, extra):
-        self.params = params
-        self.received = True
+        if self.put(params):
+            self.notify()
+
+    def put(self, params):
+        """ Store given message params. Return False if the buffer stays full. """
+        try:
+            self.messages.put(
+                (next(self.ids), params, time.time()), timeout=PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            return False
+
+    def notify(self):
+        if self.listener:
+            self.listener()
+
+    def has_message(self):
+        if self.current is None:
+            try:
+                self.current = self.messages.get_nowait()
+            except queue.Empty:
+                return False
+        return True
 
     def clear(self):
-        self.received = False
-        self.params = None
+        self.current = None
 
     def get_last_message(self):
-        pass  # TODO handle here a buffer ...
+        """ Return (id, params, time) of the message being processed or None. """
+        if self.has_message():
+            return self.current
+        return None
+
+    def size(self):
+        """ Return the number of messages waiting (current one included). """
+        return self.messages.qsize() + (self.current is not None)
 
 
 class A2p2SampClient():
-    # TODO watch hub disconnection
 
-    def __init__(self):
-        self.sampClient = SAMPIntegratedClient(
-            "A2P2 samp relay")  # TODO get title from main program class instead of HardCoded value
+    """
+    Relay ob.load.data messages from the SAMP hub.
+
+    The hub connection is watched by a heartbeat thread that pings the hub every
+    heartbeatDelay seconds, so is_connected() only reads the cached state. The
+    connection listener (if any) is called from this thread on disconnection.
+    """
+
+    def __init__(self, heartbeatDelay=HEARTBEAT_DELAY):
+        # astropy is imported on the first connection
+        self.sampClient = None
+        # Instantiate the receiver once so pending messages survive reconnections
+        self.r = Receiver(None)
+
+        self.heartbeatDelay = heartbeatDelay
+        self.heartbeat = None
+        self.stopHeartbeat = threading.Event()
+        self.connected = False
+        self.connectionListener = None
 
     def __del__(self):
         self.disconnect()
 
     def connect(self):
+        if self.sampClient is None:
+            from astropy.samp import SAMPIntegratedClient
+            self.sampClient = SAMPIntegratedClient(
+                "A2P2 samp relay")  # TODO get title from main program class instead of HardCoded value
+        elif self.sampClient.is_connected:
+            # hub connection lost: release previous connection first
+            try:
+                self.sampClient.disconnect()
+            except:
+                pass
         self.sampClient.connect()
+        self.r.client = self.sampClient
         # an error is thrown here if no hub is present
 
         # TODO get samp client name and display it in the UI
 
-        # Instantiate the receiver
-        self.r = Receiver(self.sampClient)
         # Listen for any instructions to load a table
         self.sampClient.bind_receive_call("ob.load.data", self.r.receive_call)
         self.sampClient.bind_receive_notification(
             "ob.load.data", self.r.receive_notification)
 
-    def disconnect(self):
-        self.sampClient.disconnect()
+        self.connected = True
+        self.startHeartbeat()
 
-    def is_connected(self):
+    def disconnect(self):
+        self.stopHeartbeat.set()
+        self.connected = False
+        if self.sampClient:
+            self.sampClient.disconnect()
+
+    def startHeartbeat(self):
+        if self.heartbeat and self.heartbeat.is_alive():
+            return
+        self.stopHeartbeat.clear()
+        self.heartbeat = threading.Thread(
+            target=self.runHeartbeat, name="A2P2 samp heartbeat")
+        self.heartbeat.daemon = True
+        self.heartbeat.start()
+
+    def runHeartbeat(self):
+        while self.connected and not self.stopHeartbeat.wait(self.heartbeatDelay):
+            if not self.ping():
+                self.connected = False
+                if self.connectionListener:
+                    self.connectionListener()
+
+    def ping(self):
         # Workarround the 'non' reliable is_connected attribute
         # this helps to reconnect after hub connection lost
         try:
@@ -64,6 +167,13 @@ class A2p2SampClient():
             # consider connection refused exception as not connected state
             return False
 
+    def set_connection_listener(self, listener):
+        """ Register a callable run from the heartbeat thread on disconnection. """
+        self.connectionListener = listener
+
+    def is_connected(self):
+        return self.connected
+
     def get_status(self):
         if self.is_connected():
             return "connected [%s]" % (self.sampClient.get_public_id())
@@ -73,14 +183,25 @@ class A2p2SampClient():
     def get_public_id(self):
         return self.sampClient.get_public_id()
 
+    def set_message_listener(self, listener):
+        """ Register a callable run from the samp thread on each new message. """
+        self.r.listener = listener
+
     def has_message(self):
-        return self.is_connected() and self.r.received
+        # buffered messages are still processed if the hub went away
+        return self.r.has_message()
 
-    def clear_message(self):
+    def clear_message(self, processed=True):
         return self.r.clear()
 
+    def get_message_id(self):
+        return self.r.get_last_message()[0]
+
+    def get_message_time(self):
+        return self.r.get_last_message()[2]
+
     def get_ob_url(self):
-        url = self.r.params['url']
+        url = self.r.get_last_message()[1]['url']
         if url.startswith("file:///"):
             return url[7:]
         elif url.startswith("file:/"):  # work arround bugged file urls
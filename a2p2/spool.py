@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+__all__ = []
+
+import collections
+import itertools
+import os
+import time
+
+try:
+    from os import scandir
+except ImportError:  # python 2
+    from scandir import scandir
+
+from a2p2.ob import OBXML_EXT
+
+# subdirectories receiving processed files
+DONE_DIR = "done"
+FAILED_DIR = "failed"
+# files untouched since this delay (s) are considered completely written
+SETTLE_DELAY = 1.0
+
+_replace = getattr(os, "replace", os.rename)
+
+
+class A2p2SpoolClient():
+
+    """
+    Relay OB files dropped by any tool in a spool directory.
+
+    It provides the same message interface as A2p2SampClient. scan() queues
+    new OB files once completely written, i.e. their mtime and size did not
+    change since the previous scan or they are older than SETTLE_DELAY.
+    Processed files are atomically moved into the done or failed
+    subdirectories. Only files neither queued nor moved are stat'ed and the
+    directory is not even listed if its mtime did not change, so scans cost
+    O(changes).
+    """
+
+    def __init__(self, spoolDir):
+        self.spoolDir = spoolDir
+        self.doneDir = os.path.join(spoolDir, DONE_DIR)
+        self.failedDir = os.path.join(spoolDir, FAILED_DIR)
+        for d in (self.doneDir, self.failedDir):
+            if not os.path.isdir(d):
+                os.makedirs(d)
+
+        # (mtime, size) of files not yet queued
+        self.index = {}
+        # names of queued files
+        self.queued = set()
+        self.messages = collections.deque()
+        self.ids = itertools.count(1)
+        # (id, path, time) of the file being processed
+        self.current = None
+        self.dirMtime = None
+
+    def scan(self):
+        """ Queue new OB files of the spool directory. Return the number of queued files. """
+        now = time.time()
+        dirMtime = os.stat(self.spoolDir).st_mtime
+        # recent mtimes may hide changes on filesystems with coarse timestamps
+        if dirMtime == self.dirMtime and not self.index and now - dirMtime > SETTLE_DELAY:
+            return 0
+        self.dirMtime = dirMtime
+
+        found = set()
+        nb = 0
+        for entry in scandir(self.spoolDir):
+            name = entry.name
+            if name in self.queued or not name.endswith(OBXML_EXT) or not entry.is_file():
+                continue
+            found.add(name)
+            st = entry.stat()
+            sig = (st.st_mtime, st.st_size)
+            if self.index.get(name) == sig or now - st.st_mtime > SETTLE_DELAY:
+                self.index.pop(name, None)
+                self.queued.add(name)
+                self.messages.append(
+                    (next(self.ids), os.path.join(self.spoolDir, name), now))
+                nb += 1
+            else:
+                # still being written ?
+                self.index[name] = sig
+
+        # forget files removed before being queued
+        for name in set(self.index) - found:
+            del self.index[name]
+        return nb
+
+    def has_message(self):
+        if self.current is None:
+            if not self.messages:
+                return False
+            self.current = self.messages.popleft()
+        return True
+
+    def clear_message(self, processed=True):
+        """ Move the current file into the done (or failed) subdirectory. """
+        _, path, _ = self.current
+        name = os.path.basename(path)
+        self.current = None
+        self.queued.discard(name)
+        if processed:
+            target = self.doneDir
+        else:
+            target = self.failedDir
+        try:
+            _replace(path, os.path.join(target, name))
+        except OSError:
+            # file removed in the meantime
+            pass
+
+    def get_message_id(self):
+        return self.current[0]
+
+    def get_message_time(self):
+        return self.current[2]
+
+    def get_ob_url(self):
+        return self.current[1]
+
+    def get_status(self):
+        return "watching %s" % self.spoolDir
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+__all__ = []
+
+import traceback
+
+from a2p2.console import FacilityConsoleUI
+from a2p2.vlti.facility import DEMO_USERNAME, DEMO_PASSWORD
+
+
+class VltiConsoleUI(FacilityConsoleUI):
+
+    """ Headless replacement of VltiUI: login and container selection are read on stdin. """
+
+    def __init__(self, facility):
+        FacilityConsoleUI.__init__(self, facility)
+        self.runs = []
+        # container used without asking if defined
+        self.containerId = None
+
+    def showLoginFrame(self, ob):
+        self.ob = ob
+        username = self.ask("ESO User Portal username", DEMO_USERNAME)
+        password = self.ask("ESO User Portal password", DEMO_PASSWORD, True)
+        self.facility.connectAPI(username, password, ob)
+        # no need to send the OB again once ready
+        if self.facility.isReadyToSubmit():
+            self.facility.processOB(ob)
+
+    def showTreeFrame(self, ob):
+        containerId = self.containerId
+        if not containerId:
+            containerId = self.ask("Please select a runId or folder containerId in ESO P2 database to process %s OB" %
+                                   (ob.instrumentConfiguration.name), "")
+        if containerId:
+            self.selectContainer(containerId)
+        else:
+            self.addToLog(
+                "No container selected, OBs can't be submitted.")
+
+    def fillTree(self, runs):
+        if len(runs) == 0:
+            self.ShowErrorMessage(
+                "No Runs defined, impossible to program ESO's P2 interface.")
+            return
+
+        self.runs = runs
+        for run in runs:
+            if self.facility.hasSupportedInsname(run['instrument']):
+                self.addToLog("%s %s containerId=%s" % (
+                    run['progId'], run['instrument'], run['containerId']))
+
+    def selectContainer(self, containerId):
+        """ Store the run or folder given by its containerId as the submission container. """
+        containerId = int(containerId)
+        try:
+            for run in self.runs:
+                if run['containerId'] == containerId:
+                    runId = run['runId']
+                    instrument = run['instrument']
+                    break
+            else:
+                # folder: retrieve its run
+                container, _ = self.facility.api.getContainer(containerId)
+                runId = container['runId']
+                run, _ = self.facility.api.getRun(runId)
+                instrument = run['instrument']
+            self.facility.containerInfo.store(runId, instrument, containerId)
+        except:
+            self.ShowErrorMessage(
+                "Can't use container %s (see LOG)." % containerId)
+            self.addToLog(traceback.format_exc(), False)
@@ -6,8 +6,6 @@ import os
 from a2p2.facility import Facility
 from a2p2.instrument import Instrument
 
-from a2p2.vlti.gui import VltiUI
-
 import traceback
 
 
@@ -24,6 +22,10 @@ if os.path.isdir(_confdir):
 elif not os.path.isdir(CONFDIR):
     raise RuntimeError("can't find conf directory (%r)" % (CONFDIR,))
 
+# P2 demo account
+DEMO_USERNAME = '52052'
+DEMO_PASSWORD = 'tutorial'
+
 HELPTEXT = """
 ESO's P2 repository for Observing Blocks (OBs):
 
@@ -46,7 +48,12 @@ class VltiFacility(Facility):
 
     def __init__(self, a2p2client):
         Facility.__init__(self, a2p2client, "VLTI", HELPTEXT)
-        self.ui = VltiUI(self)
+        if a2p2client.headless:
+            from a2p2.vlti.console import VltiConsoleUI
+            self.ui = VltiConsoleUI(self)
+        else:
+            from a2p2.vlti.gui import VltiUI
+            self.ui = VltiUI(self)
 
         # Instanciate instruments
         # TODO complete list and make it more object oriented
@@ -133,7 +140,7 @@ class VltiFacility(Facility):
 
     def connectAPI(self, username, password, ob):
         import p2api
-        if username == '52052':
+        if username == DEMO_USERNAME:
             type = 'demo'
         else:
             type = 'production'
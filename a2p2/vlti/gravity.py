@@ -3,17 +3,14 @@
 __all__ = []
 
 from a2p2.instrument import Instrument
-from a2p2.vlti.gui import VltiUI
 from a2p2.vlti.instrument import VltiInstrument
 from a2p2.vlti.instrument import TSF
 from a2p2.vlti.instrument import OBConstraints
 from a2p2.vlti.instrument import OBTarget
+from a2p2.vlti.instrument import OBPlan
+from a2p2.vlti.instrument import SubmissionPlan
 
-from astropy.coordinates import SkyCoord
-import cgi
-import numpy as np
 import re
-import datetime
 
 HELPTEXT = """
 Please define Gravity instrument help in a2p2/vlti/gravity.py
@@ -26,10 +23,9 @@ class Gravity(VltiInstrument):
         VltiInstrument.__init__(self, facility, "GRAVITY")
 
     # mainly corresponds to a refactoring of old utils.processXmlMessage
-    def checkOB(self, ob, p2container, dryMode=True):
-        api = self.facility.getAPI()
+    def checkOB(self, ob, p2container):
+        """ Check given OB and return its SubmissionPlan (kept for submitOB). """
         ui = self.ui
-        containerId = p2container.containerId
 
         instrumentConfiguration = ob.instrumentConfiguration
         BASELINE = ob.interferometerConfiguration.stations
@@ -51,16 +47,10 @@ class Gravity(VltiInstrument):
         else:
             ins_pol = 'IN'
 
-        # if we have more than 1 obs, then better put it in a subfolder waiting
-        # for the existence of a block sequence not yet implemented in P2
-        obsconflist = ob.observationConfiguration
-        doFolder = (len(obsconflist) > 1)
-        parentContainerId = containerId
-        if doFolder and not dryMode:
-            folderName = obsconflist[0].SCTarget.name
-            folderName = re.sub('[^A-Za-z0-9]+', '_', folderName.strip())
-            folder, _ = api.createFolder(containerId, folderName)
-            containerId = folder['containerId']
+        # OBs are put in a folder named after the first target if more than 1
+        folderName = ob.observationConfiguration[0].SCTarget.name
+        plan = SubmissionPlan(
+            re.sub('[^A-Za-z0-9]+', '_', folderName.strip()))
 
         for observationConfiguration in ob.observationConfiguration:
 
@@ -93,7 +83,7 @@ class Gravity(VltiInstrument):
                 scienceTarget)
 
             # define some default values
-            DIAMETER = float(self.get(scienceTarget, "DIAMETER", 0.0))
+            DIAMETER = self.get(scienceTarget, "DIAMETER", 0.0)
             VIS = 1.0  # FIXME
 
             # Retrieve Fluxes
@@ -106,7 +96,7 @@ class Gravity(VltiInstrument):
             GSRA = '00:00:00.000'
             GSDEC = '00:00:00.000'
             dualField = False
-            dualFieldDistance = 0.0 #needed as must exist for the argument list of createGravityOB
+            dualFieldDistance = 0.0 #needed as must exist for the argument list of compileGravityOB
             
             # initialize FT variables (must exist)
             # TODO remove next lines using a dual_acq TSF that would handle
@@ -122,7 +112,7 @@ class Gravity(VltiInstrument):
                 SEQ_FT_ROBJ_NAME = ftTarget.name
                 FTRA, FTDEC = self.getCoords(ftTarget)
                 # no PMRA, PMDE for FT !!
-                SEQ_FI_HMAG = float(ftTarget.FLUX_H)
+                SEQ_FI_HMAG = ftTarget.FLUX_H
                                     # just to say we must treat the case there
                                     # is no FT Target
                 SEQ_FT_ROBJ_MAG = self.getFlux(ftTarget, "K")
@@ -139,10 +129,10 @@ class Gravity(VltiInstrument):
                     SCtoREFmaxDist = 4000
                 # compute x,y between science and ref beams:
                 dualFieldDistance = self.getSkyDiff(obTarget.ra, obTarget.dec, FTRA, FTDEC)
-                if np.abs(dualFieldDistance[0]) < SCtoREFminDist:
+                if abs(dualFieldDistance[0]) < SCtoREFminDist:
                     raise ValueError("Dual-Field distance of two stars is  < " + str(
                         SCtoREFminDist) + " mas, Please Correct.")
-                elif np.abs(dualFieldDistance[0]) > SCtoREFmaxDist:
+                elif abs(dualFieldDistance[0]) > SCtoREFmaxDist:
                     raise ValueError("Dual-Field distance of two stars is  > " + str(
                         SCtoREFmaxDist) + " mas, Please Correct.")
 
@@ -155,7 +145,7 @@ class Gravity(VltiInstrument):
                 acqTSF.COU_AG_PMA, acqTSF.COU_AG_PMD = self.getPMCoords(
                     aoTarget)
                 # Case of CIAO to be implemented...based on v and k magnitudes?
-                COU_GS_MAG = float(aoTarget.FLUX_V)
+                COU_GS_MAG = aoTarget.FLUX_V
 
             # Guide Star
             gsTarget = ob.get(observationConfiguration, 'GSTarget')
@@ -164,7 +154,7 @@ class Gravity(VltiInstrument):
                 GSRA, GSDEC = self.getCoords(gsTarget, requirePrecision=False)
                 acqTSF.COU_AG_PMA, acqTSF.COU_AG_PMD = self.getPMCoords(
                     gsTarget)
-                COU_GS_MAG = float(gsTarget.FLUX_V)
+                COU_GS_MAG = gsTarget.FLUX_V
 
             # LST interval
             try:
@@ -190,7 +180,7 @@ class Gravity(VltiInstrument):
 
             # compute dit, ndit, nexp
             dit = self.getDit(tel, acqTSF.INS_SPEC_RES, acqTSF.INS_SPEC_POL,
-                              acqTSF.SEQ_INS_SOBJ_MAG, dualField, showWarning=dryMode)
+                              acqTSF.SEQ_INS_SOBJ_MAG, dualField, showWarning=True)
             ndit = 300 / dit
             if ndit < 10:
                 ndit = 10
@@ -216,35 +206,23 @@ class Gravity(VltiInstrument):
             sequence = 'O S O O S O O S O O S O O S O O S O O S O O S O O S O O S O O S O O S O O S O O'
             my_sequence = sequence[0:2 * nexp]
             # and store computed values in obsTSF
-            obsTSF.DET2_DIT = dit
-            obsTSF.DET2_NDIT_OBJECT = ndit
-            obsTSF.DET2_NDIT_SKY = ndit
-            obsTSF.SEQ_OBSSEQ = my_sequence
-            obsTSF.SEQ_SKY_X = 2000
-            obsTSF.SEQ_SKY_Y = 2000
-
-            # then call the ob-creation using the API.
-            if dryMode:
-                ui.addToLog(
-                    obTarget.name + " ready for p2 upload (details logged)")
-                ui.addToLog(obTarget, False)
-                ui.addToLog(obConstraints, False)
-                ui.addToLog(acqTSF, False)
-                ui.addToLog(obsTSF, False)
-
-            else:
-                self.createGravityOB(
-                    ui, self.facility.a2p2client.getUsername(
-                    ), api, containerId, obTarget, obConstraints, acqTSF, obsTSF, OBJTYPE, instrumentMode,
-                                     DIAMETER, COU_AG_GSSOURCE, GSRA, GSDEC, COU_GS_MAG, dualField, dualFieldDistance, SEQ_FT_ROBJ_NAME, SEQ_FT_ROBJ_MAG, SEQ_FT_ROBJ_DIAMETER, SEQ_FT_ROBJ_VIS, LSTINTERVAL)
-                ui.addToLog(obTarget.name + " submitted on p2")
+            obsTSF.update({'DET2.DIT': dit,
+                           'DET2.NDIT.OBJECT': ndit,
+                           'DET2.NDIT.SKY': ndit,
+                           'SEQ.OBSSEQ': my_sequence,
+                           'SEQ.SKY.X': 2000,
+                           'SEQ.SKY.Y': 2000})
+
+            # then compile what the ob-creation will send using the API.
+            obPlan = self.compileGravityOB(obTarget, obConstraints, acqTSF, obsTSF, OBJTYPE, instrumentMode,
+                                           DIAMETER, COU_AG_GSSOURCE, GSRA, GSDEC, COU_GS_MAG, dualField, dualFieldDistance, SEQ_FT_ROBJ_NAME, SEQ_FT_ROBJ_MAG, SEQ_FT_ROBJ_DIAMETER, SEQ_FT_ROBJ_VIS, LSTINTERVAL)
+            plan.append(obPlan)
+            ui.addToLog(
+                obTarget.name + " ready for p2 upload (details logged)")
+            ui.addToLog(obPlan, False)
         # endfor
-        if doFolder:
-            containerId = parentContainerId
-            doFolder = False
-
-    def submitOB(self, ob, p2container):
-        self.checkOB(ob, p2container, False)
+        self.plans[ob] = plan
+        return plan
 
     def formatRangeTable(self):
         rangeTable = self.getRangeTable()
@@ -313,64 +291,22 @@ class Gravity(VltiInstrument):
     def getGravityAcqTemplateName(self, dualField=False, OBJTYPE=None):
         return self.getGravityTemplateName("acq", dualField, OBJTYPE)
 
-    def createGravityOB(
-        self, ui, username, api, containerId, obTarget, obConstraints, acqTSF, obsTSF, OBJTYPE, instrumentMode,
+    def compileGravityOB(
+        self, obTarget, obConstraints, acqTSF, obsTSF, OBJTYPE, instrumentMode,
                         DIAMETER, COU_AG_GSSOURCE, GSRA, GSDEC, COU_GS_MAG, dualField, dualFieldDistance, SEQ_FT_ROBJ_NAME, SEQ_FT_ROBJ_MAG,
                         SEQ_FT_ROBJ_DIAMETER, SEQ_FT_ROBJ_VIS, LSTINTERVAL):
-        ui.setProgress(0.1)
-
+        """ Return the OBPlan of one observation. """
         # TODO compute value
         VISIBILITY = 1.0
 
-        # everything seems OK
-        # create new OB in container:
         goodName = re.sub('[^A-Za-z0-9]+', '_', acqTSF.SEQ_INS_SOBJ_NAME)
         OBS_DESCR = OBJTYPE[0:3] + '_' + goodName + '_GRAVITY_' + \
             obConstraints.baseline.replace('-', '') + '_' + instrumentMode
 
-        ob, obVersion = api.createOB(containerId, OBS_DESCR)
-        obId = ob['obId']
-
-        # we use obId to populate OB
-        ob['obsDescription']['name'] = OBS_DESCR[0:min(len(OBS_DESCR), 31)]
-        ob['obsDescription']['userComments'] = 'Generated by ' + username + \
-            ' using ASPRO 2 (c) JMMC on ' + datetime.datetime.now().isoformat()
-        # ob['obsDescription']['InstrumentComments'] = 'AO-B1-C2-E3' #should be
-        # a list of alternative quadruplets!
-
-        # copy target info
-        targetInfo = obTarget.getDict()
-        for key in targetInfo:
-            ob['target'][key] = targetInfo[key]
-
-        # copy constraints info
-        constraints = obConstraints.getDict()
-        for k in constraints:
-            ob['constraints'][k] = constraints[k]
-
-        ob, obVersion = api.saveOB(ob, obVersion)
-
-        # LST constraints if present
-        # by default, above 40 degree. Will generate a WAIVERABLE ERROR if not.
-        if LSTINTERVAL:
-            sidTCs, stcVersion = api.getSiderealTimeConstraints(obId)
-            lsts = LSTINTERVAL.split('/')
-            lstStartSex = lsts[0]
-            lstEndSex = lsts[1]
-            # p2 seems happy with endlst < startlst
-            # a = SkyCoord(lstStartSex+' +0:0:0',unit=(u.hourangle,u.deg))
-            # b = SkyCoord(lstEndSex+' +0:0:0',unit=(u.hourangle,u.deg))
-            # if b.ra.deg < a.ra.deg:
-            # api.saveSiderealTimeConstraints(obId,[ {'from': lstStartSex, 'to': '00:00'},{'from': '00:00','to': lstEndSex}], stcVersion)
-            # else:
-            api.saveSiderealTimeConstraints(
-                obId, [{'from': lstStartSex, 'to': lstEndSex}], stcVersion)
-        ui.setProgress(0.2)
-
-        # then, attach acquisition template(s)
-        tpl, tplVersion = api.createTemplate(
-            obId, self.getGravityAcqTemplateName(dualField=dualField))
-        # and put values
+        obPlan = OBPlan(OBS_DESCR, obTarget.getDict(),
+                        obConstraints.getDict(), LSTINTERVAL)
+
+        # acquisition template
         # start with acqTSF ones and complete manually missing ones
         values = acqTSF.getDict()
         values.update({
@@ -390,27 +326,14 @@ class Gravity(VltiInstrument):
                            'SEQ.FT.ROBJ.DIAMETER': SEQ_FT_ROBJ_DIAMETER,
                            'SEQ.FT.ROBJ.VIS':  SEQ_FT_ROBJ_VIS,
                            'SEQ.FT.MODE':      "AUTO"})
-        tpl, tplVersion = api.setTemplateParams(obId, tpl, values, tplVersion)
-        ui.setProgress(0.3)
-
-        tpl, tplVersion = api.createTemplate(
-            obId, self.getGravityObsTemplateName(OBJTYPE, dualField))
-        ui.setProgress(0.4)
+        obPlan.addTemplate(
+            self.getGravityAcqTemplateName(dualField=dualField), values)
 
         # put values. they are the same except for dual obs science (?)
         values = obsTSF.getDict()
         if dualField and OBJTYPE == 'SCIENCE':
             # not included in our general TSF
             values.update({'SEQ.RELOFF.X': "0.0", 'SEQ.RELOFF.Y': "0.0"})
-        tpl, tplVersion = api.setTemplateParams(obId, tpl, values, tplVersion)
-        ui.setProgress(0.5)
-
-        # verify OB online
-        response, _ = api.verifyOB(obId, True)
-        ui.setProgress(1.0)
-        self.showP2Response(response, ob, obId)
-
-        # fetch OB again to confirm its status change
-        #   ob, obVersion = api.getOB(obId)
-        # python3: print('Status of verified OB', obId, 'is now',
-        # ob['obStatus'])
+        obPlan.addTemplate(
+            self.getGravityObsTemplateName(OBJTYPE, dualField), values)
+        return obPlan
@@ -6,6 +6,7 @@ import sys
 import traceback
 
 from a2p2.gui import FacilityUI
+from a2p2.vlti.facility import DEMO_USERNAME, DEMO_PASSWORD
 
 if sys.version_info[0] == 2:
     from Tkinter import *
@@ -159,10 +160,7 @@ class LoginFrame(Frame):
         Frame.__init__(self, vltiUI.container)
         self.vltiUI = vltiUI
 
-        # TODO Would be better to move such config up
-        username = '52052'
-        password = 'tutorial'
-        self.login = [username, password]
+        self.login = [DEMO_USERNAME, DEMO_PASSWORD]
 
         self.loginframe = LabelFrame(
             self, text="login (ESO USER PORTAL or demo account)")
@@ -3,12 +3,17 @@
 __all__ = []
 
 import os
+import bisect
 import json
 import collections
-from astropy.coordinates import SkyCoord
-import numpy as np
+import datetime
+import weakref
+
+try:
+    from types import MappingProxyType
+except ImportError:  # python 2: no read-only view
+    MappingProxyType = dict
 from a2p2.instrument import Instrument
-from a2p2.vlti.gui import VltiUI
 
 
 class VltiInstrument(Instrument):
@@ -20,13 +25,19 @@ class VltiInstrument(Instrument):
 
         # use in latter lazy initialisation
         self.rangeTable = None
+        self.templateAliases = None
+        self.validators = None
+        self.defaults = None
+        self.tsfClasses = {}
         self.ditTable = None
+        # DitRange by (tel, spec, pol, dualFeed)
+        self.ditRanges = {}
+
+        # SubmissionPlan computed by checkOB for each OB
+        self.plans = weakref.WeakKeyDictionary()
 
     def get(self, obj, fieldname, defaultvalue):
-        if fieldname in obj._fields:
-            return getattr(obj, fieldname)
-        else:
-            return defaultvalue
+        return getattr(obj, fieldname, defaultvalue)
 
     def getCoords(self, target, requirePrecision=True):
         """
@@ -62,7 +73,7 @@ class VltiInstrument(Instrument):
         """
         PMRA = self.get(target, "PMRA", defaultPMRA)
         PMDEC = self.get(target, "PMDEC", defaultPMDEC)
-        return round(float(PMRA) / 1000.0, 4), round(float(PMDEC) / 1000.0, 4)
+        return round(PMRA / 1000.0, 4), round(PMDEC / 1000.0, 4)
 
     def getFlux(self, target, flux):
         """
@@ -70,7 +81,7 @@ class VltiInstrument(Instrument):
 
         flux in 'V', 'J', 'H'...
         """
-        return round(float(getattr(target, "FLUX_" + flux)), 3)
+        return round(getattr(target, "FLUX_" + flux), 3)
 
 
 # ditTable and rangeTable are extracted from online doc:
@@ -91,6 +102,28 @@ class VltiInstrument(Instrument):
         self.ditTable = json.load(open(f))
         return self.ditTable
 
+    def getDitRange(self, tel, spec, pol, dualFeed=False):
+        """
+        Return the DitRange compiled from ditTable for given mode: magnitude
+        bounds shifted by the Kdf (dual feed) and Kut (UT) offsets, DITs and
+        the [kmin, kmax] K range.
+        """
+        key = (tel, spec, pol, dualFeed)
+        ditRange = self.ditRanges.get(key)
+        if ditRange is None:
+            ditTable = self.getDitTable()
+            if dualFeed:
+                dK = ditTable["AT"]['Kdf']
+            else:
+                dK = 0.0
+            if tel == "UT":
+                dK += ditTable["AT"]['Kut']
+            mags = [m + dK for m in ditTable["AT"][spec][pol]['MAG']]
+            dits = ditTable["AT"][spec][pol]['DIT']
+            ditRange = DitRange(mags, dits, mags[0], mags[len(dits)])
+            self.ditRanges[key] = ditRange
+        return ditRange
+
     def getDit(self, tel, spec, pol, K, dualFeed=False, showWarning=False):
         """
         finds DIT according to ditTable and K magnitude K
@@ -106,29 +139,32 @@ class VltiInstrument(Instrument):
 #            self.ui.ShowWarningMessage("DIT table does not provide LOW values. Using MED as workarround.")
         # if spec == "LOW":
         #    spec="HIGH"
-        ditTable = self.getDitTable()
-        mags = ditTable["AT"][spec][pol]['MAG']
-        dits = ditTable["AT"][spec][pol]['DIT']
-        if dualFeed:
-            dK = ditTable["AT"]['Kdf']
-        else:
-            dK = 0.0
-        if tel == "UT":
-            dK += ditTable["AT"]['Kut']
-        for i, d in enumerate(dits):
-            if mags[i] < (K - dK) and (K - dK) <= mags[i + 1]:
-                return d
-
-        # handle out of bounds
-        kmin = 1000
-        kmax = -1000
-        for i, d in enumerate(dits):
-            kmin = min(kmin, mags[i] + dK)
-            kmax = max(kmax, mags[i + 1] + dK)
-        if kmin == K:
-            return minDIT
+        ditRange = self.getDitRange(tel, spec, pol, dualFeed)
+        # mags[i] < K <= mags[i+1] gives dits[i], kmin gives the min DIT
+        i = bisect.bisect_left(ditRange.mags, K) - 1
+        if 0 <= i < len(ditRange.dits):
+            return ditRange.dits[i]
+        if K == ditRange.kmin:
+            return ditRange.dits[0]
         raise ValueError("K mag (%f) is out of ranges [%f,%f]\n for this mode (tel=%s, spec=%s, pol=%s, dualFeed=%s)" % (
-            K, kmin, kmax, tel, spec, pol, dualFeed))
+            K, ditRange.kmin, ditRange.kmax, tel, spec, pol, dualFeed))
+
+    def getDits(self, tel, spec, pol, Ks, dualFeed=False):
+        """
+        Same as getDit() for a sequence of K magnitudes. Return a numpy array.
+
+        * a ValueError is thrown if any value is out of range *
+        """
+        import numpy as np
+        ditRange = self.getDitRange(tel, spec, pol, dualFeed)
+        Ks = np.asarray(Ks, dtype=float)
+        idx = np.searchsorted(ditRange.mags, Ks, side='left') - 1
+        idx[Ks == ditRange.kmin] = 0
+        bad = (idx < 0) | (idx >= len(ditRange.dits))
+        if bad.any():
+            raise ValueError("K mag (%s) is out of ranges [%f,%f]\n for this mode (tel=%s, spec=%s, pol=%s, dualFeed=%s)" % (
+                ", ".join("%f" % K for K in Ks[bad]), ditRange.kmin, ditRange.kmax, tel, spec, pol, dualFeed))
+        return np.asarray(ditRange.dits, dtype=float)[idx]
 
     def getRangeTable(self):
         if self.rangeTable:
@@ -137,41 +173,86 @@ class VltiInstrument(Instrument):
             self.facility.getConfDir(), self.getName() + "_rangeTable.json")
         # TODO use .tmp.json keys
         # using collections.OrderedDict to keep the order of keys:
-        self.rangeTable = json.load(
+        rangeTable = json.load(
             open(f), object_pairs_hook=collections.OrderedDict)
+        # rangeTable keys are comma separated aliases of the same template
+        self.templateAliases = {}
+        self.validators = {}
+        self.defaults = {}
+        for k in rangeTable.keys():
+            for alias in k.split(','):
+                self.templateAliases[alias.strip()] = k
+            self.validators[k] = dict((key, compileValidator(keyRange))
+                                      for key, keyRange in rangeTable[k].items())
+            # shared by every TSF of this template
+            self.defaults[k] = MappingProxyType(collections.OrderedDict(
+                (key, keyRange['default']) for key, keyRange in rangeTable[k].items() if 'default' in keyRange))
+        self.rangeTable = rangeTable
         return self.rangeTable
 
+    def getTemplateRanges(self, tpl):
+        """
+        returns the keyword ranges of template "tpl" (or one of its aliases)
+
+        ValueError raised if tpl is not found.
+        """
+        rangeTable = self.getRangeTable()
+        try:
+            return rangeTable[self.templateAliases[tpl]]
+        except KeyError:
+            raise ValueError("unknown template '%s'" % tpl)
+
+    def getValidators(self, tpl):
+        """
+        returns the keyword -> validator dict of template "tpl"
+
+        ValueError raised if tpl is not found.
+        """
+        self.getRangeTable()
+        try:
+            return self.validators[self.templateAliases[tpl]]
+        except KeyError:
+            raise ValueError("unknown template '%s'" % tpl)
+
+    def getTSFClass(self, tpl):
+        """
+        returns the TSF class of template "tpl", created on first use
+
+        ValueError raised if tpl is not found.
+        """
+        ranges = self.getTemplateRanges(tpl)
+        canonical = self.templateAliases[tpl]
+        cls = self.tsfClasses.get(canonical)
+        if cls is None:
+            name = canonical.split(',')[0].strip().replace('.tsf', '')
+            cls = createTSFClass(name, ranges.keys())
+            self.tsfClasses[canonical] = cls
+        return cls
+
+    def getKeywordRange(self, tpl, key):
+        """
+        returns the range dictionnary of keyword "key" for template "tpl"
+
+        ValueError raised if key or tpl is not found.
+        """
+        try:
+            return self.getTemplateRanges(tpl)[key]
+        except KeyError:
+            raise ValueError(
+                "unknown keyword '%s' in template '%s'" % (key, tpl))
+
     def isInRange(self, tpl, key, value):
         """
         check if "value" is in range of keyword "key" for template "tpl"
 
         ValueError raised if key or tpl is not found.
         """
-        rangeTable = self.getRangeTable()
-        _tpl = ''
-        # -- find relevant range dictionnary
-        for k in rangeTable.keys():
-            if tpl in [l.strip() for l in k.split(',')]:
-                _tpl = k
-        if _tpl == '':
-            raise ValueError("unknown template '%s'" % tpl)
-        if not key in rangeTable[_tpl].keys():
+        try:
+            validator = self.getValidators(tpl)[key]
+        except KeyError:
             raise ValueError(
                 "unknown keyword '%s' in template '%s'" % (key, tpl))
-        if 'min' in rangeTable[_tpl][key].keys() and \
-           'max' in rangeTable[_tpl][key].keys():
-            return value >= rangeTable[_tpl][key]['min'] and\
-                value <= rangeTable[_tpl][key]['max']
-        if 'list' in rangeTable[_tpl][key].keys():
-            return value in rangeTable[_tpl][key]['list']
-        if 'spaceseparatedlist' in rangeTable[_tpl][key].keys():
-            ssl = rangeTable[_tpl][key]['spaceseparatedlist']
-            for e in value.strip().split(" "):
-                if not e in ssl:
-                    return False
-            return True
-        # no range provided in tsf file
-        return True
+        return validator(value)
 
     def getRange(self, tpl, key):
         """
@@ -179,25 +260,25 @@ class VltiInstrument(Instrument):
 
         ValueError raised if key or tpl is not found.
         """
-        rangeTable = self.getRangeTable()
-        _tpl = ''
-        # -- find relevant range dictionnary
-        for k in rangeTable.keys():
-            if tpl in [l.strip() for l in k.split(',')]:
-                _tpl = k
-        if _tpl == '':
+        keyRange = self.getKeywordRange(tpl, key)
+        if 'min' in keyRange and 'max' in keyRange:
+            return (keyRange['min'], keyRange['max'])
+        if 'list' in keyRange:
+            return keyRange['list']
+        if 'spaceseparatedlist' in keyRange:
+            return keyRange['spaceseparatedlist']
+
+    def getDefaults(self, tpl):
+        """
+        returns the read-only keywords/default values of template "tpl"
+
+        ValueError raised if tpl is not found.
+        """
+        self.getRangeTable()
+        try:
+            return self.defaults[self.templateAliases[tpl]]
+        except KeyError:
             raise ValueError("unknown template '%s'" % tpl)
-        if not key in rangeTable[_tpl].keys():
-            raise ValueError(
-                "unknown keyword '%s' in template '%s'" % (key, tpl))
-        if 'min' in rangeTable[_tpl][key].keys() and \
-           'max' in rangeTable[_tpl][key].keys():
-            return (rangeTable[_tpl][key]['min'], rangeTable[_tpl][key]['max'])
-        if 'list' in rangeTable[_tpl][key].keys():
-            return rangeTable[_tpl][key]['list']
-        if 'spaceseparatedlist' in rangeTable[_tpl][key].keys():
-            for e in value.split(" "):
-                return rangeTable[_tpl][key]['spaceseparatedlist']
 
     def getRangeDefaults(self, tpl):
         """
@@ -205,21 +286,12 @@ class VltiInstrument(Instrument):
 
         ValueError raised if tpl is not found.
         """
-        rangeTable = self.getRangeTable()
-        _tpl = ''
-        # -- find relevant range dictionnary
-        for k in rangeTable.keys():
-            if tpl in [l.strip() for l in k.split(',')]:
-                _tpl = k
-        if _tpl == '':
-            raise ValueError("unknown template '%s'" % tpl)
-        res = {}
-        for key in rangeTable[_tpl].keys():
-            if 'default' in rangeTable[_tpl][key].keys():
-                res[key] = rangeTable[_tpl][key]["default"]
-        return res
+        return dict(self.getDefaults(tpl))
 
     def getSkyDiff(self, ra, dec, ftra, ftdec):
+        # astropy is only required in dual field mode
+        from astropy.coordinates import SkyCoord
+        import numpy as np
         science = SkyCoord(ra, dec, frame='icrs', unit='deg')
         ft = SkyCoord(ftra, ftdec, frame='icrs', unit='deg')
         ra_offset = (science.ra - ft.ra) * np.cos(ft.dec.to('radian'))
@@ -249,9 +321,74 @@ class VltiInstrument(Instrument):
             # s += Matisse.formatRangeTable(self)
             # s += "\n\nMatisseDitTable:\n"
             # s += Matisse.formatDitTable(self)
+            pass
 
         return s
 
+    def submitOB(self, ob, p2container):
+        """ Send the plan computed by checkOB (run now if not done yet) to P2. """
+        plan = self.plans.get(ob)
+        if plan is None:
+            plan = self.checkOB(ob, p2container)
+        self.submitPlan(plan, p2container)
+
+    def submitPlan(self, plan, p2container):
+        """ Create the OBs of given SubmissionPlan in the P2 container. """
+        api = self.facility.getAPI()
+        containerId = p2container.containerId
+        # if we have more than 1 obs, then better put it in a subfolder waiting
+        # for the existence of a block sequence not yet implemented in P2
+        if len(plan) > 1:
+            folder, _ = api.createFolder(containerId, plan.folderName)
+            containerId = folder['containerId']
+
+        username = self.facility.a2p2client.getUsername()
+        for obPlan in plan:
+            self.createOB(api, containerId, username, obPlan)
+            self.ui.addToLog(obPlan.target['name'] + " submitted on p2")
+
+    def createOB(self, api, containerId, username, obPlan):
+        ui = self.ui
+        ui.setProgress(0.1)
+
+        ob, obVersion = api.createOB(containerId, obPlan.description)
+        obId = ob['obId']
+
+        # we use obId to populate OB
+        ob['obsDescription']['name'] = obPlan.description[0:31]
+        ob['obsDescription']['userComments'] = 'Generated by ' + username + \
+            ' using ASPRO 2 (c) JMMC on ' + datetime.datetime.now().isoformat()
+        # ob['obsDescription']['InstrumentComments'] = 'AO-B1-C2-E3' #should be
+        # a list of alternative quadruplets!
+
+        # copy target and constraints info
+        ob['target'].update(obPlan.target)
+        ob['constraints'].update(obPlan.constraints)
+
+        ob, obVersion = api.saveOB(ob, obVersion)
+
+        # LST constraints if present
+        # by default, above 40 degree. Will generate a WAIVERABLE ERROR if not.
+        if obPlan.lstInterval:
+            sidTCs, stcVersion = api.getSiderealTimeConstraints(obId)
+            lstStartSex, lstEndSex = obPlan.lstInterval.split('/')[0:2]
+            # p2 seems happy with endlst < startlst
+            api.saveSiderealTimeConstraints(
+                obId, [{'from': lstStartSex, 'to': lstEndSex}], stcVersion)
+        ui.setProgress(0.2)
+
+        # then, attach templates and put their values
+        for i, (name, values) in enumerate(obPlan.templates):
+            tpl, tplVersion = api.createTemplate(obId, name)
+            tpl, tplVersion = api.setTemplateParams(
+                obId, tpl, values, tplVersion)
+            ui.setProgress(0.2 + 0.7 * (i + 1) / len(obPlan.templates))
+
+        # verify OB online
+        response, _ = api.verifyOB(obId, True)
+        ui.setProgress(1.0)
+        self.showP2Response(response, ob, obId)
+
     def showP2Response(self, response, ob, obId):
         if response['observable']:
             msg = 'OB ' + \
@@ -264,120 +401,203 @@ class VltiInstrument(Instrument):
         self.ui.ShowInfoMessage(msg)
         self.ui.addToLog('\n'.join(response['messages']) + '\n\n')
 
+def compileValidator(keyRange):
+    """
+    Return a callable checking that a value satisfies given rangeTable
+    constraint (min/max, list or spaceseparatedlist).
+    """
+    if 'min' in keyRange and 'max' in keyRange:
+        vmin = keyRange['min']
+        vmax = keyRange['max']
+        return lambda value: vmin <= value <= vmax
+    if 'list' in keyRange:
+        values = frozenset(keyRange['list'])
+
+        def inList(value):
+            try:
+                return value in values
+            except TypeError:  # unhashable
+                return False
+        return inList
+    if 'spaceseparatedlist' in keyRange:
+        values = frozenset(keyRange['spaceseparatedlist'])
+        return lambda value: values.issuperset(value.strip().split(" "))
+    # no range provided in tsf file
+    return lambda value: True
+
+
+# DIT table of one mode compiled by VltiInstrument.getDitRange
+DitRange = collections.namedtuple('DitRange', ('mags', 'dits', 'kmin', 'kmax'))
+
 # TemplateSignatureFile
-# use new style class to get __getattr__ advantage
+# TSF(instrument, tpl) returns an instance of the class generated for the
+# template (see VltiInstrument.getTSFClass) whose properties map attribute
+# names to keywords (e.g. DET2_DIT for DET2.DIT).
 
 
 class TSF(object):
+    __slots__ = ('tpl', 'instrument', 'validators', 'defaults', 'tsfParams')
+
+    def __new__(cls, instrument, tpl):
+        if cls is TSF:
+            cls = instrument.getTSFClass(tpl)
+        return object.__new__(cls)
 
     def __init__(self, instrument, tpl):
         self.tpl = tpl
         self.instrument = instrument
-        supportedTpl = instrument.getRangeTable().keys()
+        self.validators = instrument.getValidators(tpl)
 
-        # init with default values for every keywords
-        self.tsfParams = self.instrument.getRangeDefaults(tpl)
+        # assigned values overlay the default values shared by the
+        # instrument (flattened by getDict)
+        self.defaults = instrument.getDefaults(tpl)
+        self.tsfParams = {}
 
-        self.__initialised = True
-        # after initialisation, setting attributes is the same as setting an
-        # item
+    def check(self, key, value):
+        try:
+            validator = self.validators[key]
+        except KeyError:
+            raise ValueError(
+                "unknown keyword '%s' in template '%s'" % (key, self.tpl))
+        if not validator(value):
+            raise ValueError(
+                "Parameter value (%s) is out of range for keyword %s in template %s " % (str(value), key, self.tpl))
 
     def set(self, key, value, checkRange=True):
         if checkRange:
-            if not self.instrument.isInRange(self.tpl, key, value):
-                raise ValueError(
-                    "Parameter value (%s) is out of range for keyword %s in template %s " % (str(value), key, self.tpl))
+            self.check(key, value)
         # TODO check that key is valid when checkRange is False
         self.tsfParams[key] = value
 
+    def update(self, values, checkRange=True):
+        """ Set every keyword of given dict. Nothing is set if one value is invalid. """
+        if checkRange:
+            for key, value in values.items():
+                self.check(key, value)
+        self.tsfParams.update(values)
+
     def get(self, key):
         # TODO offer to get default value
-        return self.tsfParams[key]
+        try:
+            return self.tsfParams[key]
+        except KeyError:
+            return self.defaults[key]
 
     def getDict(self):
-        return self.tsfParams
+        values = dict(self.defaults)
+        values.update(self.tsfParams)
+        return values
 
-    def __getattr__(self, name):  # called for non instance attributes (i.e. keywords)
-        rname = name.replace('_', '.')
-        if rname in self.tsfParams:
-            return self.tsfParams[rname]
-        else:
+    def __str__(self):
+        buffer = "TSF values (%s) : \n"
+        values = self.getDict()
+        for e in values:
+            buffer += "    %30s : %s\n" % (e, str(values[e]))
+        return buffer
+
+
+def keywordProperty(key):
+    """ Return the TSF property giving access to keyword key. """
+    def fget(self):
+        try:
+            return self.tsfParams[key]
+        except KeyError:
+            pass
+        try:
+            return self.defaults[key]
+        except KeyError:
             raise AttributeError(
-                "unknown keyword '%s' in template '%s'" % (rname, self.tpl))
+                "no value for keyword '%s' in template '%s'" % (key, self.tpl))
 
-    def __setattr__(self, name, value):
-        if name in self.__dict__:  # any normal attributes are handled normal
-            return object.__setattr__(self, name, value)
-        if not '_TSF__initialised' in self.__dict__:  # this test allows attributes to be set in the __init__ method
-            return object.__setattr__(self, name, value)
+    def fset(self, value):
+        self.set(key, value)
+    return property(fget, fset, doc=key)
 
-        # continue with keyword try
-        rname = name.replace('_', '.')
-        self.set(rname, value)
 
-    def __str__(self):
-        buffer = "TSF values (%s) : \n"
-        for e in self.tsfParams:
-            buffer += "    %30s : %s\n" % (e, str(self.tsfParams[e]))
-        return buffer
+def createTSFClass(name, keys):
+    """ Return a TSF subclass with a property for every given keyword. """
+    attributes = {'__slots__': ()}
+    for key in keys:
+        attributes.setdefault(key.replace('.', '_'), keywordProperty(key))
+    return type(str(name), (TSF,), attributes)
 
 
 class FixedDict(object):
 
-    def __init__(self,  keys):
-        self.myKeys = keys
-        self.myValues = {}
-
-        # Note: we could enhance code for checking + default value support such as TSF
-        # Note: keys may be synchronized with p2
+    """
+    Record of some keywords stored in slots (given by subclasses).
+    getDict() returns the ones that were set.
+    """
+    __slots__ = ()
 
-        self.__initialised = True
-        # after initialisation, setting attributes is the same as setting an
-        # item
+    # Note: we could enhance code for checking + default value support such as TSF
+    # Note: keys may be synchronized with p2
 
     def getDict(self):
-        return self.myValues
-
-    def __getattr__(self, name):  # called for non instance attributes (i.e. keywords)
-        rname = name.replace('_', '.')
-        if rname in self.myValues:
-            return self.myValues[rname]
-        else:
-            raise AttributeError(name)
-
-    def __setattr__(self, name, value):
-        if name in self.__dict__:  # any normal attributes are handled normally
-            # print("set1 %s to %s"%(name, str(value)))
-            return object.__setattr__(self, name, value)
-        if not '_FixedDict__initialised' in self.__dict__:  # this test allows attributes to be set in the __init__ method
-            # print("set2 %s to %s"%(name, str(value)))
-            return object.__setattr__(self, name, value)
-
-        # continue with keyword try
-        # print("set3 %s to %s"%(name, str(value)))
-        rname = name.replace('_', '.')
-        if rname in self.myKeys:
-            self.myValues[name] = value
-        else:
-            raise ValueError(
-                "keyword %s is not part of supported ones %s " % (name, self.myKeys))
+        values = {}
+        for k in self.__slots__:
+            try:
+                values[k] = getattr(self, k)
+            except AttributeError:
+                pass
+        return values
 
     def __str__(self):
         buffer = "%s values:\n" % (type(self).__name__)
-        for e in self.myValues:
-            buffer += "    %30s : %s\n" % (e, str(self.myValues[e]))
+        values = self.getDict()
+        for e in values:
+            buffer += "    %30s : %s\n" % (e, str(values[e]))
         return buffer
 
 
 class OBTarget(FixedDict):
-
-    def __init__(self):
-        FixedDict.__init__(
-            self, ('name', 'ra', 'dec', 'properMotionRa', 'properMotionDec'))
+    __slots__ = ('name', 'ra', 'dec', 'properMotionRa', 'properMotionDec')
 
 
 class OBConstraints(FixedDict):
+    __slots__ = ('name', 'seeing', 'skyTransparency',
+                 'baseline', 'airmass', 'fli')
+
+
+class OBPlan(object):
+
+    """
+    Everything required to create one OB on P2, computed once by checkOB:
+    description, target and constraints values, LST interval and the
+    (template name, values) list to attach.
+    """
 
-    def __init__(self):
-        FixedDict.__init__(
-            self, ('name', 'seeing', 'skyTransparency', 'baseline', 'airmass', 'fli'))
+    def __init__(self, description, target, constraints, lstInterval=None):
+        self.description = description
+        self.target = dict(target)
+        self.constraints = dict(constraints)
+        self.lstInterval = lstInterval
+        self.templates = []
+
+    def addTemplate(self, name, values):
+        self.templates.append((name, dict(values)))
+
+    def __str__(self):
+        buffer = "OB '%s':\n" % self.description
+        buffer += "    target      : %s\n" % self.target
+        buffer += "    constraints : %s\n" % self.constraints
+        if self.lstInterval:
+            buffer += "    LST interval: %s\n" % self.lstInterval
+        for name, values in self.templates:
+            buffer += "    template %s : %s\n" % (name, values)
+        return buffer
+
+
+class SubmissionPlan(list):
+
+    """
+    OBPlans of an Aspro2 OB. They are created in a folder named folderName
+    when there are more than one.
+    """
+
+    def __init__(self, folderName=None):
+        list.__init__(self)
+        self.folderName = folderName
+
+    def __str__(self):
+        return "".join(str(p) for p in self)
@@ -3,15 +3,11 @@
 __all__ = []
 
 from a2p2.instrument import Instrument
-from a2p2.vlti.gui import VltiUI
 from a2p2.vlti.instrument import VltiInstrument
 from a2p2.vlti.instrument import TSF
 from a2p2.vlti.instrument import OBConstraints
 from a2p2.vlti.instrument import OBTarget
 
-from astropy.coordinates import SkyCoord
-import cgi
-import numpy as np
 import re
 import datetime
 
@@ -85,7 +81,7 @@ class Matisse(VltiInstrument):
                 scienceTarget)
 
             # define some default values
-            DIAMETER = float(self.get(scienceTarget, "DIAMETER", 0.0))
+            DIAMETER = self.get(scienceTarget, "DIAMETER", 0.0)
             VIS = 1.0  # FIXME
 
             # Retrieve Fluxes
@@ -118,7 +114,7 @@ class Matisse(VltiInstrument):
                 COU_GS_SOURCE = 'SETUPFILE'  # since we have an GS
                 GSRA, GSDEC = self.getCoords(gsTarget, requirePrecision=False)
                 # no PMRA, PMDE for GS !!
-                COU_GS_MAG = float(gsTarget.FLUX_V)
+                COU_GS_MAG = gsTarget.FLUX_V
 
             # LST interval
             try:
@@ -3,17 +3,14 @@
 __all__ = []
 
 from a2p2.instrument import Instrument
-from a2p2.vlti.gui import VltiUI
 from a2p2.vlti.instrument import VltiInstrument
 from a2p2.vlti.instrument import TSF
 from a2p2.vlti.instrument import OBConstraints
 from a2p2.vlti.instrument import OBTarget
+from a2p2.vlti.instrument import OBPlan
+from a2p2.vlti.instrument import SubmissionPlan
 
-from astropy.coordinates import SkyCoord
-import cgi
-import numpy as np
 import re
-import datetime
 
 HELPTEXT = """
 Please define PIONIER instrument help in a2p2/vlti/pionier.py
@@ -26,10 +23,9 @@ class Pionier(VltiInstrument):
         VltiInstrument.__init__(self, facility, "PIONIER")
 
     # mainly corresponds to a refactoring of old utils.processXmlMessage
-    def checkOB(self, ob, p2container, dryMode=True):
-        api = self.facility.getAPI()
+    def checkOB(self, ob, p2container):
+        """ Check given OB and return its SubmissionPlan (kept for submitOB). """
         ui = self.ui
-        containerId = p2container.containerId
 
         instrumentConfiguration = ob.instrumentConfiguration
         BASELINE = ob.interferometerConfiguration.stations
@@ -47,16 +43,10 @@ class Pionier(VltiInstrument):
             if disp in instrumentMode[0:len(disp)]:
                 ins_disp = disp
 
-        # if we have more than 1 obs, then better put it in a subfolder waiting
-        # for the existence of a block sequence not yet implemented in P2
-        obsconflist = ob.observationConfiguration
-        doFolder = (len(obsconflist) > 1)
-        parentContainerId = containerId
-        if doFolder and not dryMode:
-            folderName = obsconflist[0].Target.name
-            folderName = re.sub('[^A-Za-z0-9]+', '_', folderName.strip())
-            folder, _ = api.createFolder(containerId, folderName)
-            containerId = folder['containerId']
+        # OBs are put in a folder named after the first target if more than 1
+        folderName = ob.observationConfiguration[0].SCTarget.name
+        plan = SubmissionPlan(
+            re.sub('[^A-Za-z0-9]+', '_', folderName.strip()))
 
         for observationConfiguration in ob.observationConfiguration:
 
@@ -92,7 +82,7 @@ class Pionier(VltiInstrument):
                 scienceTarget)
 
             # define some default values
-            DIAMETER = float(self.get(scienceTarget, "DIAMETER", 0.0))
+            DIAMETER = self.get(scienceTarget, "DIAMETER", 0.0)
             VIS = 1.0  # FIXME
 
             # Retrieve Fluxes
@@ -123,7 +113,7 @@ class Pionier(VltiInstrument):
                 TEL_COU_GSSOURCE = 'SETUPFILE'  # since we have an GS
                 GSRA, GSDEC = self.getCoords(gsTarget, requirePrecision=False)
                 # no PMRA, PMDE for GS !!
-                TEL_COU_MAG = float(gsTarget.FLUX_V)
+                TEL_COU_MAG = gsTarget.FLUX_V
 
             # LST interval
             try:
@@ -159,30 +149,16 @@ class Pionier(VltiInstrument):
             # kappaTSF.SEQ_DOIT=False
             # darkTSF.SEQ_DOIT=True
 
-            # then call the ob-creation using the API.
-            if dryMode:
-                ui.addToLog(
-                    obTarget.name + " ready for p2 upload (details logged)")
-                ui.addToLog(obTarget, False)
-                ui.addToLog(obConstraints, False)
-                ui.addToLog(acqTSF, False)
-                ui.addToLog(obsTSF, False)
-                ui.addToLog(kappaTSF, False)
-                ui.addToLog(darkTSF, False)
-
-            else:
-                self.createPionierOB(
-                    ui, self.facility.a2p2client.getUsername(
-                    ), api, containerId, obTarget, obConstraints, acqTSF,
-                                     obsTSF, kappaTSF, darkTSF, OBJTYPE, instrumentMode, TEL_COU_GSSOURCE, GSRA, GSDEC, TEL_COU_MAG, LSTINTERVAL)
-                ui.addToLog(obTarget.name + " submitted on p2")
+            # then compile what the ob-creation will send using the API.
+            obPlan = self.compilePionierOB(obTarget, obConstraints, acqTSF,
+                                           obsTSF, kappaTSF, darkTSF, OBJTYPE, instrumentMode, TEL_COU_GSSOURCE, GSRA, GSDEC, TEL_COU_MAG, LSTINTERVAL)
+            plan.append(obPlan)
+            ui.addToLog(
+                obTarget.name + " ready for p2 upload (details logged)")
+            ui.addToLog(obPlan, False)
         # endfor
-        if doFolder:
-            containerId = parentContainerId
-            doFolder = False
-
-    def submitOB(self, ob, p2container):
-        self.checkOB(ob, p2container, False)
+        self.plans[ob] = plan
+        return plan
 
     def getPionierTemplateName(self, templateType, OBJTYPE):
         objType = "calibrator"
@@ -195,62 +171,18 @@ class Pionier(VltiInstrument):
     def getPionierObsTemplateName(self, OBJTYPE):
         return self.getPionierTemplateName("obs", OBJTYPE)
 
-    def createPionierOB(
-        self, ui, username, api, containerId, obTarget, obConstraints, acqTSF, obsTSF, kappaTSF, darkTSF, OBJTYPE, instrumentMode,
+    def compilePionierOB(
+        self, obTarget, obConstraints, acqTSF, obsTSF, kappaTSF, darkTSF, OBJTYPE, instrumentMode,
                        TEL_COU_GSSOURCE, GSRA, GSDEC, TEL_COU_MAG, LSTINTERVAL):
-        ui.setProgress(0.1)
-
-        # TODO compute value
-        VISIBILITY = 1.0
-
-        # everything seems OK
-        # create new OB in container:
+        """ Return the OBPlan of one observation. """
         goodName = re.sub('[^A-Za-z0-9]+', '_', acqTSF.TARGET_NAME)
         OBS_DESCR = OBJTYPE[0:3] + '_' + goodName + '_PIONIER_' + \
             obConstraints.baseline.replace('-', '') + '_' + instrumentMode
 
-        ob, obVersion = api.createOB(containerId, OBS_DESCR)
-        obId = ob['obId']
-
-        # we use obId to populate OB
-        ob['obsDescription']['name'] = OBS_DESCR[0:min(len(OBS_DESCR), 31)]
-        ob['obsDescription']['userComments'] = 'Generated by ' + username + \
-            ' using ASPRO 2 (c) JMMC on ' + datetime.datetime.now().isoformat()
-        # ob['obsDescription']['InstrumentComments'] = 'AO-B1-C2-E3' #should be
-        # a list of alternative quadruplets!
-
-        # copy target info
-        targetInfo = obTarget.getDict()
-        for key in targetInfo:
-            ob['target'][key] = targetInfo[key]
-
-        # copy constraints info
-        constraints = obConstraints.getDict()
-        for k in constraints:
-            ob['constraints'][k] = constraints[k]
-
-        ob, obVersion = api.saveOB(ob, obVersion)
-
-        # LST constraints if present
-        # by default, above 40 degree. Will generate a WAIVERABLE ERROR if not.
-        if LSTINTERVAL:
-            sidTCs, stcVersion = api.getSiderealTimeConstraints(obId)
-            lsts = LSTINTERVAL.split('/')
-            lstStartSex = lsts[0]
-            lstEndSex = lsts[1]
-            # p2 seems happy with endlst < startlst
-            # a = SkyCoord(lstStartSex+' +0:0:0',unit=(ugetPionierTemplateName.hourangle,u.deg))
-            # b = SkyCoord(lstEndSex+' +0:0:0',unit=(u.hourangle,u.deg))
-            # if b.ra.deg < a.ra.deg:
-            # api.saveSiderealTimeConstraints(obId,[ {'from': lstStartSex, 'to': '00:00'},{'from': '00:00','to': lstEndSex}], stcVersion)
-            # else:
-            api.saveSiderealTimeConstraints(
-                obId, [{'from': lstStartSex, 'to': lstEndSex}], stcVersion)
-        ui.setProgress(0.2)
-
-        # then, attach acquisition template(s)
-        tpl, tplVersion = api.createTemplate(obId, 'PIONIER_acq')
-        # and put values
+        obPlan = OBPlan(OBS_DESCR, obTarget.getDict(),
+                        obConstraints.getDict(), LSTINTERVAL)
+
+        # acquisition template
         # start with acqTSF ones and complete manually missing ones
         values = acqTSF.getDict()
         values.update({'TEL.COU.GSSOURCE':   TEL_COU_GSSOURCE,
@@ -258,38 +190,11 @@ class Pionier(VltiInstrument):
                        'TEL.COU.DELTA':   GSDEC,
                        'TEL.COU.MAG':  round(TEL_COU_MAG, 3)
                        })
-
-        tpl, tplVersion = api.setTemplateParams(obId, tpl, values, tplVersion)
-        ui.setProgress(0.3)
-
-        # Put Obs template
-        tpl, tplVersion = api.createTemplate(
-            obId, self.getPionierObsTemplateName(OBJTYPE))
-        ui.setProgress(0.4)
-        values = obsTSF.getDict()
-        tpl, tplVersion = api.setTemplateParams(obId, tpl, values, tplVersion)
-        ui.setProgress(0.5)
-
-        # put Kappa Matrix Template
-        tpl, tplVersion = api.createTemplate(obId, 'PIONIER_gen_cal_kappa')
-        ui.setProgress(0.6)
-        values = kappaTSF.getDict()
-        tpl, tplVersion = api.setTemplateParams(obId, tpl, values, tplVersion)
-        ui.setProgress(0.7)
-
-        # put Dark Template
-        tpl, tplVersion = api.createTemplate(obId, 'PIONIER_gen_cal_dark')
-        ui.setProgress(0.8)
-        values = darkTSF.getDict()
-        tpl, tplVersion = api.setTemplateParams(obId, tpl, values, tplVersion)
-        ui.setProgress(0.9)
-
-        # verify OB online
-        response, _ = api.verifyOB(obId, True)
-        ui.setProgress(1.0)
-        self.showP2Response(response, ob, obId)
-
-        # fetch OB again to confirm its status change
-        #   ob, obVersion = api.getOB(obId)
-        # python3: print('Status of verified OB', obId, 'is now',
-        # ob['obStatus'])
+        obPlan.addTemplate('PIONIER_acq', values)
+
+        # Obs, Kappa Matrix and Dark templates
+        obPlan.addTemplate(
+            self.getPionierObsTemplateName(OBJTYPE), obsTSF.getDict())
+        obPlan.addTemplate('PIONIER_gen_cal_kappa', kappaTSF.getDict())
+        obPlan.addTemplate('PIONIER_gen_cal_dark', darkTSF.getDict())
+        return obPlan
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# Measure the delay between the reception of a SAMP ob.load.data message and
+# the start of FacilityManager.processOB.
+#
+# usage: python bench_latency.py [nb_messages] [--gui]
+# (a display is required by the Tk main window in --gui mode)
+#
+
+import os
+import sys
+import threading
+import time
+
+from a2p2 import A2p2Client
+
+OBXML = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                     "aspro-sample.obxml")
+
+
+def bench(nb_messages=20, period=0.05, headless=True):
+    latencies = []
+
+    with A2p2Client(True, headless) as a2p2c:
+        def processOB(ob):
+            latencies.append(
+                time.time() - a2p2c.a2p2SampClient.get_message_time())
+            if len(latencies) == nb_messages:
+                a2p2c.ui._requestAbort()
+        a2p2c.facilityManager.processOB = processOB
+
+        def send():
+            # simulate Aspro2 messages coming through the hub
+            for i in range(nb_messages):
+                time.sleep(period)
+                a2p2c.a2p2SampClient.r.receive_notification(
+                    None, "bench", "ob.load.data", {"url": OBXML}, {})
+        threading.Thread(target=send).start()
+
+        a2p2c.run()
+
+    latencies.sort()
+    print("%d messages, latency (ms): min=%.2f median=%.2f max=%.2f" % (
+        len(latencies), 1000 * latencies[0],
+        1000 * latencies[len(latencies) // 2], 1000 * latencies[-1]))
+    return latencies
+
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if a != "--gui"]
+    if args:
+        bench(int(args[0]), headless="--gui" not in sys.argv)
+    else:
+        bench(headless="--gui" not in sys.argv)
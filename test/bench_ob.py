@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# Compare OB parsing time of the legacy etree_to_dict + json round-trip with
+# the current OB class on the samples of this directory and on a synthetic OB
+# of 500 targets.
+#
+# usage: python bench_ob.py [nb_targets]
+#
+
+import glob
+import json
+import os
+import sys
+import tempfile
+import timeit
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from a2p2.ob import OB, etree_to_dict
+
+TESTDIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def legacyOB(url):
+    """ Parse given OB file with the former json round-trip (returns a dict of attributes). """
+    d = etree_to_dict(ET.parse(url).getroot())
+    ds = d[list(d)[0]]
+    attributes = {}
+    for e in ds.keys():
+        o = json.loads(
+            json.dumps(ds[e]), object_hook=lambda d: namedtuple(e, d.keys())(*d.values()))
+        if "observationConfiguration" in e and not isinstance(o, list):
+            o = [o]
+        attributes[e] = o
+    return attributes
+
+
+def syntheticOB(nb_targets):
+    """ Return the path of a temporary OB with nb_targets observationConfigurations. """
+    tree = ET.parse(os.path.join(TESTDIR, "aspro-sample.obxml"))
+    root = tree.getroot()
+    obsconfs = root.findall("observationConfiguration")
+    schedule = root.find("observationSchedule")
+    for obsconf in obsconfs:
+        root.remove(obsconf)
+    root.remove(schedule)
+    for i in range(nb_targets):
+        obsconf = ET.fromstring(ET.tostring(obsconfs[i % len(obsconfs)]))
+        obsconf.set("id", "target_%d" % i)
+        root.append(obsconf)
+    root.append(schedule)
+
+    fd, path = tempfile.mkstemp(suffix=".obxml")
+    os.close(fd)
+    tree.write(path)
+    return path
+
+
+def bench(path, number):
+    legacy = min(timeit.repeat(lambda: legacyOB(path), number=number, repeat=3))
+    current = min(timeit.repeat(lambda: OB(path), number=number, repeat=3))
+    print("%-40s legacy %8.3f ms   current %8.3f ms   speedup x%.1f" % (
+        os.path.basename(path), 1000 * legacy / number, 1000 * current / number, legacy / current))
+
+
+if __name__ == '__main__':
+    nb_targets = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    for path in sorted(glob.glob(os.path.join(TESTDIR, "*.obxml"))):
+        bench(path, 200)
+
+    path = syntheticOB(nb_targets)
+    try:
+        print("synthetic OB with %d targets:" % nb_targets)
+        bench(path, 5)
+    finally:
+        os.remove(path)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# Measure the number of TSF keyword assignments per second, with the former
+# constraint dict inspection and with the compiled validators.
+#
+# usage: python bench_tsf.py [nb_assignments]
+#
+
+import sys
+import time
+
+from a2p2 import batch
+from a2p2.vlti.instrument import TSF
+
+VALUES = {'DET2.DIT': 10, 'DET2.NDIT.OBJECT': 30, 'DET2.NDIT.SKY': 30,
+          'SEQ.OBSSEQ': "O S O O S O", 'SEQ.SKY.X': 2000, 'SEQ.SKY.Y': 2000}
+
+
+def legacyIsInRange(instrument, tpl, key, value):
+    """ Former VltiInstrument.isInRange (alias scan then constraint inspection). """
+    rangeTable = instrument.getRangeTable()
+    _tpl = ''
+    for k in rangeTable.keys():
+        if tpl in [l.strip() for l in k.split(',')]:
+            _tpl = k
+    if _tpl == '':
+        raise ValueError("unknown template '%s'" % tpl)
+    if not key in rangeTable[_tpl].keys():
+        raise ValueError("unknown keyword '%s' in template '%s'" % (key, tpl))
+    if 'min' in rangeTable[_tpl][key].keys() and \
+       'max' in rangeTable[_tpl][key].keys():
+        return value >= rangeTable[_tpl][key]['min'] and\
+            value <= rangeTable[_tpl][key]['max']
+    if 'list' in rangeTable[_tpl][key].keys():
+        return value in rangeTable[_tpl][key]['list']
+    if 'spaceseparatedlist' in rangeTable[_tpl][key].keys():
+        ssl = rangeTable[_tpl][key]['spaceseparatedlist']
+        for e in value.strip().split(" "):
+            if not e in ssl:
+                return False
+        return True
+    return True
+
+
+def rate(f, nb):
+    start = time.time()
+    for i in range(nb // len(VALUES)):
+        f()
+    return nb / (time.time() - start)
+
+
+if __name__ == '__main__':
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 600000
+
+    client = batch.createClient()
+    gravity = client.facilityManager.facilities["VLTI"].getInstrument("GRAVITY")
+    tpl = "GRAVITY_dual_obs_exp.tsf"
+    tsf = TSF(gravity, tpl)
+
+    def legacy():
+        for k, v in VALUES.items():
+            if not legacyIsInRange(gravity, tpl, k, v):
+                raise ValueError(k)
+            tsf.tsfParams[k] = v
+
+    def assign():
+        for k, v in VALUES.items():
+            tsf.set(k, v)
+
+    print("legacy isInRange : %10.0f assignments/s" % rate(legacy, nb))
+    print("TSF.set          : %10.0f assignments/s" % rate(assign, nb))
+    print("TSF.update       : %10.0f assignments/s" %
+          rate(lambda: tsf.update(VALUES), nb))
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+
+import os
+
+from a2p2 import batch
+
+TESTDIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_checkOBs(tmpdir):
+    # same OB on ATs is valid
+    with open(os.path.join(TESTDIR, "aspro-sample.obxml")) as f:
+        obxml = f.read().replace("UT1 UT2 UT3 UT4", "A0 G1 J2 K0")
+    atOB = tmpdir.join("aspro-sample-at.obxml")
+    atOB.write(obxml)
+
+    files = batch.listOBs([TESTDIR, str(atOB)])
+    assert len(files) == 5
+
+    results = batch.checkOBs(files, 2)
+    errors = dict((os.path.basename(path), error)
+                  for path, error, logs in results)
+    assert errors["aspro-sample-at.obxml"] is None
+    assert "K mag" in errors["aspro-sample.obxml"]
+    assert "precision in RA" in errors["aspro-sample-bad-coords.obxml"]
+    assert "SEQ.INS.SOBJ.MAG" in errors["aspro-sample-bad-k.obxml"]
+
+    report = batch.formatReport(results, "Check")
+    assert report.startswith("Check: 5 OB(s), 1 OK, 4 failed")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+import os
+
+from a2p2 import A2p2Client
+
+OBXML = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                     "aspro-sample.obxml")
+
+
+def test_headless():
+    with A2p2Client(True, headless=True) as a2p2c:
+        obs = []
+        a2p2c.facilityManager.processOB = lambda ob: obs.append(ob)
+        a2p2c.processing = False
+        for i in range(3):
+            a2p2c.a2p2SampClient.r.receive_notification(
+                None, "aspro2", "ob.load.data", {"url": "file://" + OBXML}, {})
+        a2p2c.processMessages()
+
+        assert len(obs) == 3
+        assert obs[0].instrumentConfiguration.name == "GRAVITY"
+        assert not a2p2c.a2p2SampClient.has_message()
+
+
+def test_spool(tmpdir):
+    import shutil
+    spoolDir = str(tmpdir)
+    shutil.copy(OBXML, spoolDir)
+    os.utime(os.path.join(spoolDir, "aspro-sample.obxml"), (0, 0))
+    with open(os.path.join(spoolDir, "bad.obxml"), "w") as f:
+        f.write("not an OB")
+    os.utime(os.path.join(spoolDir, "bad.obxml"), (0, 0))
+
+    with A2p2Client(True, headless=True, spoolDir=spoolDir) as a2p2c:
+        obs = []
+        a2p2c.facilityManager.processOB = lambda ob: obs.append(ob)
+        a2p2c.processing = False
+        a2p2c.a2p2SpoolClient.scan()
+        a2p2c.processMessages()
+
+        assert len(obs) == 1
+        assert os.listdir(os.path.join(spoolDir, "done")) == [
+            "aspro-sample.obxml"]
+        assert os.listdir(os.path.join(spoolDir, "failed")) == ["bad.obxml"]
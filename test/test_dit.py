@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+import pytest
+
+from a2p2 import batch
+
+
+def legacyDit(ditTable, tel, spec, pol, K, dualFeed=False):
+    """ Former linear scan of VltiInstrument.getDit (None if out of range). """
+    mags = ditTable["AT"][spec][pol]['MAG']
+    dits = ditTable["AT"][spec][pol]['DIT']
+    dK = ditTable["AT"]['Kdf'] if dualFeed else 0.0
+    if tel == "UT":
+        dK += ditTable["AT"]['Kut']
+    for i, d in enumerate(dits):
+        if mags[i] < (K - dK) and (K - dK) <= mags[i + 1]:
+            return d
+    return None
+
+
+@pytest.fixture(scope="module")
+def gravity():
+    client = batch.createClient()
+    return client.facilityManager.facilities["VLTI"].getInstrument("GRAVITY")
+
+
+def test_getDit(gravity):
+    ditTable = gravity.getDitTable()
+    Ks = [k / 4.0 for k in range(-30, 70)]
+    for tel in ("AT", "UT"):
+        for spec in ("LOW", "MED", "HIGH"):
+            for pol in ("IN", "OUT"):
+                for dualFeed in (False, True):
+                    for K in Ks:
+                        expected = legacyDit(
+                            ditTable, tel, spec, pol, K, dualFeed)
+                        if expected is None and K != gravity.getDitRange(tel, spec, pol, dualFeed).kmin:
+                            with pytest.raises(ValueError):
+                                gravity.getDit(tel, spec, pol, K, dualFeed)
+                        elif expected is not None:
+                            assert gravity.getDit(
+                                tel, spec, pol, K, dualFeed) == expected
+
+
+def test_getDits(gravity):
+    ditRange = gravity.getDitRange("AT", "MED", "IN")
+    Ks = [ditRange.kmin, 0.5, 2.9, 3.0, ditRange.kmax]
+    assert list(gravity.getDits("AT", "MED", "IN", Ks)) == \
+        [gravity.getDit("AT", "MED", "IN", K) for K in Ks]
+    assert gravity.getDit("AT", "MED", "IN", ditRange.kmin) == min(ditRange.dits)
+    with pytest.raises(ValueError):
+        gravity.getDits("AT", "MED", "IN", [1.0, ditRange.kmax + 1])
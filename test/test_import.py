@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# heavy dependencies loaded on demand only
+LAZY_MODULES = ("astropy", "numpy", "tkinter", "Tkinter")
+# max cumulative import time (s) of headless validation (about 0.6s before
+# lazy imports, mostly astropy)
+IMPORT_BUDGET = 0.3
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="-X importtime requires python 3.7")
+
+
+def importtime(*args):
+    """ Return {module: cumulative import time (s)} of given python command. """
+    env = dict(os.environ, PYTHONPATH=ROOTDIR)
+    p = subprocess.Popen((sys.executable, "-X", "importtime") + args, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    _, err = p.communicate()
+    assert p.returncode == 0, err
+    times = {}
+    for line in err.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            try:
+                times[module.strip()] = int(cumulative) / 1e6
+            except ValueError:  # header
+                pass
+    return times
+
+
+def lazyModules(times):
+    return [m for m in times if m.split(".")[0] in LAZY_MODULES]
+
+
+def test_help():
+    times = importtime(os.path.join(ROOTDIR, "scripts", "a2p2"), "--help")
+    assert "a2p2" not in times
+    assert lazyModules(times) == []
+
+
+def test_headless_validation():
+    times = importtime(
+        "-c", "import a2p2.batch; a2p2.batch.createClient()")
+    assert lazyModules(times) == []
+    assert times["a2p2"] + times["a2p2.batch"] < IMPORT_BUDGET
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+import glob
+import json
+import os
+import xml.etree.ElementTree as ET
+
+from a2p2.ob import OB, etree_to_dict, object_to_dict
+
+TESTDIR = os.path.dirname(os.path.abspath(__file__))
+
+NUMERIC = ('PMRA', 'PMDEC', 'PARALLAX', 'DIAMETER')
+
+
+def typed(value, key=None):
+    """ Convert numeric values of given etree_to_dict() output as Target does. """
+    if isinstance(value, list):
+        return [typed(e, key) for e in value]
+    if isinstance(value, dict):
+        return dict((k, typed(v, k)) for k, v in value.items())
+    if value is not None and (key in NUMERIC or key.startswith('FLUX_')):
+        return float(value)
+    return value
+
+
+def test_same_as_dict():
+    for path in glob.glob(os.path.join(TESTDIR, "*.obxml")):
+        d = etree_to_dict(ET.parse(path).getroot())
+        ds = d[list(d)[0]]
+        ob = OB(path)
+        assert sorted(ob.elements) == sorted(ds.keys())
+        for e in ds.keys():
+            expected = typed(ds[e], e)
+            if e == "observationConfiguration" and not isinstance(expected, list):
+                expected = [expected]
+            assert json.dumps(object_to_dict(getattr(ob, e)), sort_keys=True) == \
+                json.dumps(expected, sort_keys=True)
+
+
+def test_attributes():
+    ob = OB(os.path.join(TESTDIR, "aspro-sample.obxml"))
+    assert ob.interferometerConfiguration.name == "VLTI"
+    assert ob.interferometerConfiguration.pops is None
+    assert [o.id for o in ob.observationConfiguration] == [
+        "HD_17081", "HD_16825"]
+    target = ob.observationConfiguration[0].SCTarget
+    assert target.FLUX_K == 4.505
+    assert target.RA == "02:44:07.34928"
+    assert abs(target.raDeg - 41.0306220) < 1e-6
+    assert abs(target.decDeg + 13.8586981) < 1e-6
+    assert ob.get(target, "DIAMETER", 0.0) == 0.0
+    assert ob.get(ob.observationConfiguration[1].SCTarget, "DIAMETER") == 0.448
+    assert ob.get(ob.observationConfiguration[0], "FTTarget") is None
+    assert list(ob.getFluxes(target).keys()) == ["V", "J", "H", "K"]
+    assert [o.ref for o in ob.observationSchedule.OB] == [
+        "HD_16825", "HD_17081", "HD_16825"]
+    assert '"HD 17081"' in str(ob)
+
+
+def test_record_classes():
+    import a2p2.ob
+    ob = OB(os.path.join(TESTDIR, "aspro-sample.obxml"))
+    ob2 = OB(os.path.join(TESTDIR, "aspro-sample.obxml"))
+    oc = ob.observationConfiguration
+    assert type(oc[0].observationConstraints) is type(
+        oc[1].observationConstraints)
+    assert type(oc[0].SCTarget) is type(
+        ob2.observationConfiguration[0].SCTarget)
+
+    maxClasses = a2p2.ob.MAX_RECORD_CLASSES
+    a2p2.ob.MAX_RECORD_CLASSES = 2
+    try:
+        for i in range(5):
+            a2p2.ob.recordClass("test", ("f%d" % i,))
+        assert len(a2p2.ob._recordClasses) <= 2
+        assert ("test", ("f4",)) in a2p2.ob._recordClasses
+    finally:
+        a2p2.ob.MAX_RECORD_CLASSES = maxClasses
+
+
+def test_streaming():
+    for path in glob.glob(os.path.join(TESTDIR, "*.obxml")):
+        ob = OB(path)
+        streamed = OB(path, streaming=True)
+        assert streamed.elements == ob.elements
+        assert len(streamed.observationConfiguration) == len(
+            ob.observationConfiguration)
+        assert object_to_dict(list(streamed.observationConfiguration)) == \
+            object_to_dict(ob.observationConfiguration)
+        assert streamed.observationConfiguration[-1].id == \
+            ob.observationConfiguration[-1].id
+        assert object_to_dict(streamed.observationSchedule) == \
+            object_to_dict(ob.observationSchedule)
+        assert "streamed observationConfiguration" in str(streamed)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+import json
+import os
+import shutil
+
+from a2p2.ob import OB, object_to_dict
+from a2p2.obcache import OBCache, CACHE_EXT
+
+OBXML = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                     "aspro-sample.obxml")
+
+
+def test_hit(tmpdir):
+    cache = OBCache(str(tmpdir.join("cache")))
+    ob = cache.load(OBXML)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # same content under another name
+    copy = str(tmpdir.join("copy.obxml"))
+    shutil.copy(OBXML, copy)
+    cached = OBCache(cache.cacheDir).load(copy)
+    assert json.dumps(object_to_dict(cached.ds), sort_keys=True) == \
+        json.dumps(object_to_dict(OB(OBXML).ds), sort_keys=True)
+    assert cached.observationConfiguration[0].SCTarget.FLUX_K == \
+        ob.observationConfiguration[0].SCTarget.FLUX_K
+
+    cache.load(copy)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    with open(copy, "a") as f:
+        f.write("\n")
+    cache.load(copy)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_eviction(tmpdir):
+    cache = OBCache(str(tmpdir.join("cache")), 1)
+    cache.load(OBXML)
+    assert os.listdir(cache.cacheDir) == []
+
+    cache = OBCache(cache.cacheDir)
+    path = str(tmpdir.join("ob.obxml"))
+    for i in range(3):
+        with open(OBXML) as f, open(path, "w") as g:
+            g.write(f.read() + "\n" * i)
+        cache.load(path)
+    size = max(os.path.getsize(os.path.join(cache.cacheDir, n))
+               for n in os.listdir(cache.cacheDir))
+    cache.maxSize = 2 * size
+    cache.evict()
+    assert len(os.listdir(cache.cacheDir)) == 2
+
+
+def test_corrupted(tmpdir):
+    cache = OBCache(str(tmpdir.join("cache")))
+    cache.load(OBXML)
+    name = os.listdir(cache.cacheDir)[0]
+    assert name.endswith(CACHE_EXT)
+    with open(os.path.join(cache.cacheDir, name), "wb") as f:
+        f.write(b"garbage")
+    cache.load(OBXML)
+    assert (cache.hits, cache.misses) == (0, 2)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+import os
+
+from a2p2 import batch
+from a2p2.ob import OB
+
+TESTDIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeAPI():
+
+    """ Record P2 calls. """
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args):
+            self.calls.append((name,) + args)
+            if name == "createFolder":
+                return {'containerId': 2}, 1
+            if name in ("createOB", "saveOB"):
+                return {'obId': 3, 'name': 'OB', 'obsDescription': {}, 'target': {}, 'constraints': {}}, 1
+            if name == "verifyOB":
+                return {'observable': True, 'messages': []}, 1
+            return {}, 1
+        return call
+
+
+def test_plan(tmpdir):
+    with open(os.path.join(TESTDIR, "aspro-sample.obxml")) as f:
+        obxml = f.read().replace("UT1 UT2 UT3 UT4", "A0 G1 J2 K0")
+    path = tmpdir.join("aspro-sample-at.obxml")
+    path.write(obxml)
+
+    client = batch.createClient()
+    ob = OB(str(path))
+    facility, instrument = batch.getInstrument(client, ob)
+    facility.api = FakeAPI()
+    facility.containerInfo.store(1, "GRAVITY", 1)
+
+    plan = instrument.checkOB(ob, facility.containerInfo)
+    nb = len(ob.observationConfiguration)
+    assert len(plan) == nb
+    obPlan = plan[0]
+    assert obPlan.description.startswith("SCI_")
+    assert obPlan.target['name']
+    assert [t[0] for t in obPlan.templates] == [
+        "GRAVITY_single_acq", "GRAVITY_single_obs_exp"]
+    assert obPlan.templates[1][1]['DET2.DIT'] > 0
+
+    # submission only sends the plan
+    def noCheck(*args):
+        raise AssertionError("OB checked twice")
+    instrument.checkOB = noCheck
+    instrument.submitOB(ob, facility.containerInfo)
+    calls = [c[0] for c in facility.api.calls]
+    assert calls.count("createOB") == nb
+    assert calls.count("createTemplate") == 2 * nb
+    assert calls.count("createFolder") == (1 if nb > 1 else 0)
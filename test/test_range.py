@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+import pytest
+
+from a2p2 import batch
+
+
+@pytest.fixture(scope="module")
+def gravity():
+    client = batch.createClient()
+    return client.facilityManager.facilities["VLTI"].getInstrument("GRAVITY")
+
+
+def test_aliases(gravity):
+    ranges = gravity.getTemplateRanges("GRAVITY_single_obs_exp.tsf")
+    for alias in ("GRAVITY_single_obs_calibrator.tsf", "GRAVITY_dual_obs_exp.tsf"):
+        assert gravity.getTemplateRanges(alias) is ranges
+    assert gravity.getRange("GRAVITY_dual_obs_calibrator.tsf", "SEQ.OBSSEQ") == \
+        ranges["SEQ.OBSSEQ"]["spaceseparatedlist"]
+    assert gravity.isInRange("GRAVITY_dual_obs_exp.tsf", "SEQ.OBSSEQ", "O S O")
+    assert not gravity.isInRange("GRAVITY_dual_obs_exp.tsf", "SEQ.OBSSEQ", "O X")
+
+
+def test_unknown(gravity):
+    with pytest.raises(ValueError) as e:
+        gravity.isInRange("GRAVITY_foo.tsf", "DET2.DIT", 1.0)
+    assert "unknown template 'GRAVITY_foo.tsf'" in str(e.value)
+    with pytest.raises(ValueError) as e:
+        gravity.getRange("GRAVITY_gen_acq.tsf", "FOO")
+    assert "unknown keyword 'FOO'" in str(e.value)
+
+
+def test_tsf_update(gravity):
+    from a2p2.vlti.instrument import TSF
+    tsf = TSF(gravity, "GRAVITY_single_obs_exp.tsf")
+    tsf.update({'DET2.NDIT.OBJECT': 20, 'SEQ.OBSSEQ': "O S O"})
+    assert tsf.DET2_NDIT_OBJECT == 20
+    assert tsf.SEQ_OBSSEQ == "O S O"
+
+    with pytest.raises(ValueError):
+        tsf.update({'DET2.NDIT.OBJECT': 30, 'SEQ.OBSSEQ': "O X"})
+    assert tsf.DET2_NDIT_OBJECT == 20
+    with pytest.raises(ValueError):
+        tsf.DET2_NDIT_OBJECT = -1
+
+
+def test_tsf_defaults(gravity):
+    from a2p2.vlti.instrument import TSF
+    defaults = gravity.getDefaults("GRAVITY_gen_acq.tsf")
+    tsf1 = TSF(gravity, "GRAVITY_gen_acq.tsf")
+    tsf2 = TSF(gravity, "GRAVITY_gen_acq.tsf")
+    assert tsf1.defaults is tsf2.defaults is defaults
+    assert tsf1.getDict() == dict(defaults) == gravity.getRangeDefaults(
+        "GRAVITY_gen_acq.tsf")
+
+    tsf1.SEQ_INS_SOBJ_MAG = 5.0
+    assert tsf1.getDict()['SEQ.INS.SOBJ.MAG'] == 5.0
+    assert tsf2.SEQ_INS_SOBJ_MAG == defaults['SEQ.INS.SOBJ.MAG']
+    assert len(tsf2.tsfParams) == 0
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+from a2p2.samp import Receiver
+
+
+class FakeSampClient():
+
+    def __init__(self):
+        self.replies = []
+
+    def reply(self, msg_id, response):
+        self.replies.append((msg_id, response["samp.status"]))
+
+
+def test_burst():
+    client = FakeSampClient()
+    r = Receiver(client)
+    for i in range(5):
+        r.receive_call(None, "aspro2", "msg%d" % i, "ob.load.data",
+                       {"url": "file:///tmp/ob%d.obxml" % i}, {})
+
+    urls = []
+    while r.has_message():
+        msgid, params, _ = r.get_last_message()
+        urls.append(params["url"])
+        r.clear()
+
+    assert urls == ["file:///tmp/ob%d.obxml" % i for i in range(5)]
+    assert [s for _, s in client.replies] == ["samp.ok"] * 5
+    assert r.size() == 0
+
+
+def test_full_buffer():
+    import a2p2.samp
+    timeout = a2p2.samp.PUT_TIMEOUT
+    a2p2.samp.PUT_TIMEOUT = 0.01
+    try:
+        client = FakeSampClient()
+        r = Receiver(client, maxsize=2)
+        for i in range(3):
+            r.receive_call(None, "aspro2", "msg%d" % i, "ob.load.data",
+                           {"url": "ob%d" % i}, {})
+        assert [s for _, s in client.replies] == [
+            "samp.ok", "samp.ok", "samp.error"]
+        assert r.get_last_message()[0] == 1
+        assert r.size() == 2
+    finally:
+        a2p2.samp.PUT_TIMEOUT = timeout
+
+
+def test_listener():
+    r = Receiver(FakeSampClient())
+    woken = []
+    r.listener = lambda: woken.append(r.size())
+    r.receive_notification(None, "aspro2", "ob.load.data", {"url": "ob"}, {})
+    r.receive_call(None, "aspro2", "msg", "ob.load.data", {"url": "ob"}, {})
+    assert woken == [1, 2]
+
+
+class FakeHubClient(FakeSampClient):
+
+    def __init__(self):
+        FakeSampClient.__init__(self)
+        self.is_connected = False
+        self.hubRunning = True
+        self.pings = 0
+
+    def connect(self):
+        self.is_connected = True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def bind_receive_call(self, mtype, function):
+        pass
+
+    def bind_receive_notification(self, mtype, function):
+        pass
+
+    def ping(self):
+        self.pings += 1
+        if not self.hubRunning:
+            raise IOError("connection refused")
+        return True
+
+
+def test_heartbeat():
+    import threading
+    from a2p2.samp import A2p2SampClient
+
+    client = A2p2SampClient(heartbeatDelay=0.01)
+    hub = FakeHubClient()
+    client.sampClient = hub
+    lost = threading.Event()
+    client.set_connection_listener(lost.set)
+
+    client.connect()
+    assert client.is_connected()
+
+    hub.hubRunning = False
+    assert lost.wait(5)
+    assert not client.is_connected()
+
+    # reconnection restarts the heartbeat
+    hub.hubRunning = True
+    client.connect()
+    assert client.is_connected()
+    client.disconnect()
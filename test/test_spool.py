@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+
+import os
+import time
+
+from a2p2.spool import A2p2SpoolClient
+
+
+def drop(spoolDir, name, age=10):
+    path = os.path.join(spoolDir, name)
+    with open(path, "w") as f:
+        f.write("<ob/>")
+    t = time.time() - age
+    os.utime(path, (t, t))
+    return path
+
+
+def test_spool(tmpdir):
+    spoolDir = str(tmpdir)
+    spool = A2p2SpoolClient(spoolDir)
+    assert spool.scan() == 0
+    assert not spool.has_message()
+
+    drop(spoolDir, "a.obxml")
+    drop(spoolDir, "b.obxml")
+    drop(spoolDir, "notes.txt")
+    # just written file is queued on next scan if unchanged
+    drop(spoolDir, "c.obxml", age=0)
+    assert spool.scan() == 2
+
+    processed = []
+    while spool.has_message():
+        processed.append(os.path.basename(spool.get_ob_url()))
+        spool.clear_message(processed[-1] != "b.obxml")
+    assert processed == ["a.obxml", "b.obxml"]
+    assert os.listdir(spool.doneDir) == ["a.obxml"]
+    assert os.listdir(spool.failedDir) == ["b.obxml"]
+
+    assert spool.scan() == 1
+    assert spool.has_message()
+    assert spool.get_ob_url().endswith("c.obxml")
+    spool.clear_message()
+    assert spool.scan() == 0
+    assert sorted(os.listdir(spool.doneDir)) == ["a.obxml", "c.obxml"]